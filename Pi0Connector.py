@@ -8,13 +8,16 @@ Provides secure connection endpoints for:
 All traffic is HMAC-signed and XOR-encrypted via USSKernel.  
 """  
   
-from Pi0Unified import Pi0System, USSKernel  
+from Pi0Unified import Pi0System  
+from USSKernel import USSKernel  
   
 class Pi0Connector:  
     def __init__(self, secret_key='connectorsecret'):  
         # Core system and secure channel  
         self.system = Pi0System()  
         self.channel = USSKernel(secret_key=secret_key)  
+        # Last export_since cursor handed to each requester  
+        self._export_cursors = {}  
   
     def import_data(self, source_id, raw_bytes):  
         """  
@@ -37,14 +40,19 @@ class Pi0Connector:
         packet = self.channel.communicate(source_id, repr(ack))  
         return packet  
   
-    def export_snapshot(self, requester_id):  
+    def export_snapshot(self, requester_id, incremental=False):  
         """  
         Securely export Pi0System state:  
-         1. Generate full export  
+         1. Generate full export (or, with incremental=True, only what  
+            was added since this requester's previous snapshot)  
          2. Serialize to bytes  
          3. Encrypt & sign  
         """  
-        snapshot = self.system.export()  
+        if incremental:  
+            snapshot = self.system.export_since(self._export_cursors.get(requester_id))  
+            self._export_cursors[requester_id] = snapshot['cursor']  
+        else:  
+            snapshot = self.system.export()  
         data_str = repr(snapshot)  
         # 3) send via channel  
         packet = self.channel.communicate(requester_id, data_str)  
@@ -66,4 +74,8 @@ class Pi0Connector:
         result = self.system.iterate()  
         # 4) send result back  
         packet = self.channel.communicate(peer_id, repr(result))  
-        return packet  
\ No newline at end of file
+        return packet  
+  
+    def close(self):  
+        self.system.close()  
+        self.channel.close()  
\ No newline at end of file
@@ -7,12 +7,34 @@ A standalone, library-free Pi0 system:
  - Pi0System: unified orchestration  
 """  
   
+import os  
+import tempfile  
+  
+from history_log import SpillingLog  
+from lcg_ops import advance_dna, dna_at  
+from uss_codec import encode, text_sum  
+  
+  
+def _spill_path(spill_dir, name):  
+    return os.path.join(spill_dir, name) if spill_dir else None  
+  
+def _spill_root(spill_dir, name):  
+    # A fresh directory per instance: a restarted kernel counts from 0 again,  
+    # so it must never append to (or reload) a previous run's segments  
+    if not spill_dir:  
+        return None  
+    os.makedirs(spill_dir, exist_ok=True)  
+    return tempfile.mkdtemp(prefix=name + '-', dir=spill_dir)  
+  
 class Pi0Kernel:  
-    def __init__(self, name='Pi0Kernel'):  
+    def __init__(self, name='Pi0Kernel', retain=1024, spill_dir=None):  
         self.name = name  
         self.generation = 0  
         self.dna = {'pi': 3141592653589793, 'phi': 1618033988749895}  
-        self.memory = []  
+        self.seed_dna = dict(self.dna)  
+        # Newest `retain` snapshots in RAM, older ones spilled to disk  
+        self.spill_dir = _spill_root(spill_dir, name)  
+        self.memory = SpillingLog(retain, _spill_path(self.spill_dir, 'memory'), key='generation')  
   
     def iterate(self):  
         # Simple Linear Congruential Generator on dna values  
@@ -23,7 +45,42 @@ class Pi0Kernel:
         self.memory.append(snapshot)  
         return {'kernel': self.name, 'generation': self.generation, 'dna': dict(self.dna)}  
   
+    def advance(self, k):  
+        """  
+        Jump k generations in O(log k); dna matches k iterate() calls.  
+        Only the landing generation is recorded in memory (nothing for k=0).  
+        """  
+        if k:  
+            self.dna = advance_dna(self.dna, k)  
+            self.generation += k  
+            snapshot = {'generation': self.generation, 'dna': dict(self.dna)}  
+            self.memory.append(snapshot)  
+        return {'kernel': self.name, 'generation': self.generation, 'dna': dict(self.dna)}  
+  
+    def dna_at(self, generation):  
+        """dna at any generation, without changing the kernel."""  
+        return dna_at(self.seed_dna, self.dna, self.generation, generation)  
+  
+    def close(self):  
+        """Close the spilled memory; temporary spill files are deleted."""  
+        self.memory.close()  
+  
     def complex_transform(self, matrix, power, mod):  
+        """  
+        Fast modular matrix exponentiation.  
+        `power` may be an int or a list of powers (one result per power).  
+        Uses the cached NumPy engine in modmat_ops when NumPy is available,  
+        else the pure Python loops below.  
+        """  
+        try:  
+            from modmat_ops import matrix_power_mod  
+        except ImportError:  
+            if isinstance(power, int):  
+                return self.complex_transform_py(matrix, power, mod)  
+            return [self.complex_transform_py(matrix, p, mod) for p in power]  
+        return matrix_power_mod(matrix, power, mod)  
+  
+    def complex_transform_py(self, matrix, power, mod):  
         """  
         Fast modular matrix exponentiation (pure Python).  
         """  
@@ -62,33 +119,48 @@ class Pi0Kernel:
             'memory': list(self.memory)  
         }  
   
+    def export_since(self, cursor=0):  
+        """export() with only the memory entries from index `cursor` on."""  
+        return {  
+            'type': self.name,  
+            'dna': dict(self.dna),  
+            'generation': self.generation,  
+            'memory': self.memory.since(cursor)  
+        }  
+  
 class USSKernel:  
-    def __init__(self, name='USSKernel'):  
+    def __init__(self, name='USSKernel', retain=1024, spill_dir=None):  
         self.name = name  
         self.protocol = 'USS-Quantum'  
-        self.audit_log = []  
-        self.memory = []  
+        self.spill_dir = _spill_root(spill_dir, name)  
+        self.audit_log = SpillingLog(retain, _spill_path(self.spill_dir, 'audit_log'), key='timestamp')  
+        self.memory = SpillingLog(retain, _spill_path(self.spill_dir, 'memory'), key='timestamp')  
         self._counter = 0  
   
     def communicate(self, target, message):  
-        # 1) timestamp  
-        self._counter += 1  
-        timestamp = self._counter  
-        # 2) simple hash of (target+message+timestamp)  
-        protocol_hash = sum(ord(c) for c in (target + message + str(timestamp))) % 100000  
-        # 3) encode by shifting each char by timestamp mod 256  
-        encoded = ''.join(  
-            chr((ord(c) + timestamp) % 256) for c in message  
-        )  
-        record = {  
-            'target': target,  
-            'encoded': encoded,  
-            'protocol_hash': protocol_hash,  
-            'timestamp': timestamp  
-        }  
-        self.audit_log.append(record)  
-        self.memory.append(record)  
-        return record  
+        return self.communicate_many(target, [message])[0]  
+  
+    def communicate_many(self, target, messages):  
+        """Send each message to target in turn; one record per message."""  
+        target_sum = text_sum(target)  
+        records = []  
+        for message in messages:  
+            # 1) timestamp  
+            self._counter += 1  
+            timestamp = self._counter  
+            # 2) simple hash of (target+message+timestamp)  
+            protocol_hash = (target_sum + text_sum(message) + text_sum(str(timestamp))) % 100000  
+            # 3) encode by shifting each char by timestamp mod 256 (table lookup)  
+            record = {  
+                'target': target,  
+                'encoded': encode(message, timestamp),  
+                'protocol_hash': protocol_hash,  
+                'timestamp': timestamp  
+            }  
+            self.audit_log.append(record)  
+            self.memory.append(record)  
+            records.append(record)  
+        return records  
   
     def iterate(self):  
         # Version bump based on audit count  
@@ -107,12 +179,29 @@ class USSKernel:
             'memory': list(self.memory)  
         }  
   
+    def export_since(self, audit_cursor=0, memory_cursor=0):  
+        return {  
+            'type': self.name,  
+            'protocol': self.protocol,  
+            'audit_log': self.audit_log.since(audit_cursor),  
+            'memory': self.memory.since(memory_cursor)  
+        }  
+  
+    def close(self):  
+        self.audit_log.close()  
+        self.memory.close()  
+  
 class Pi0System:  
-    def __init__(self):  
-        self.pi0_kernel = Pi0Kernel()  
-        self.uss_kernel = USSKernel()  
+    def __init__(self, retain=1024, spill_dir=None):  
+        # Histories keep `retain` entries in RAM and spill the rest under  
+        # a fresh subdirectory of spill_dir (a temp dir if None);  
+        # query(lo, hi) reads them back  
+        self.spill_dir = _spill_root(spill_dir, 'Pi0System')  
+        self.pi0_kernel = Pi0Kernel(retain=retain, spill_dir=self.spill_dir)  
+        self.uss_kernel = USSKernel(retain=retain, spill_dir=self.spill_dir)  
         self.iteration_count = 0  
-        self.history = []  
+        self.history = SpillingLog(retain, _spill_path(self.spill_dir, 'history'),  
+                                   key=lambda e: e['pi0']['generation'])  
   
     def iterate(self):  
         self.iteration_count += 1  
@@ -141,6 +230,39 @@ class Pi0System:
             'history': list(self.history)  
         }  
   
+    def export_cursor(self):  
+        # Positions one past the newest entry of every exported log  
+        return {  
+            'pi0_memory': len(self.pi0_kernel.memory),  
+            'uss_audit_log': len(self.uss_kernel.audit_log),  
+            'uss_memory': len(self.uss_kernel.memory),  
+            'history': len(self.history)  
+        }  
+  
+    def export_since(self, cursor=None):  
+        """  
+        Incremental export(): the same layout and scalar state, but each  
+        list holds only entries added after `cursor` (None = everything).  
+        Pass the returned 'cursor' to the next call.  
+        """  
+        cursor = cursor or {}  
+        new_cursor = self.export_cursor()  
+        return {  
+            'system': 'Pi0System',  
+            'iterations': self.iteration_count,  
+            'pi0_kernel': self.pi0_kernel.export_since(cursor.get('pi0_memory', 0)),  
+            'uss_kernel': self.uss_kernel.export_since(cursor.get('uss_audit_log', 0),  
+                                                       cursor.get('uss_memory', 0)),  
+            'history': self.history.since(cursor.get('history', 0)),  
+            'cursor': new_cursor  
+        }  
+  
+    def close(self):  
+        """Close the kernels' and the system's histories."""  
+        self.pi0_kernel.close()  
+        self.uss_kernel.close()  
+        self.history.close()  
+  
 # ASCII Table: Simple vs Complex Math in Pi0Kernel  
 simple_vs_complex = """  
 ┌─────────────┬────────────────────────────────┐  
@@ -1,45 +1,159 @@
 # pi0_architecture.py  
   
-from pi0_system import update_vector, lift_density, Q_correction  
+import numpy as np  
   
-def run_pi0_pipeline(x0, A, W1, W2, eps, steps):  
+from batch_ops import UpdateEngine  
+from density_ops import q_correction_batch, q_correction_diagonal  
+from fixed_point import solve_fixed_point  
+  
+def allocate_trajectory(steps, n, dtype="float64", path=None):  
+    """  
+    Preallocated (steps, n) trajectory buffer.  
+    With `path`, the buffer is a .npy file opened as np.memmap, so rows  
+    stream to disk instead of accumulating in RAM.  
+    """  
+    if path is None:  
+        return np.empty((steps, n), dtype=dtype)  
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype,  
+                                     shape=(steps, n))  
+  
+def trim_trajectory(path, rows):  
+    """  
+    Shrink a trajectory .npy to its first `rows` rows in place: the shape  
+    in the header is rewritten (padded to the same header length) and the  
+    file is truncated, so load_trajectory sees only the rows written.  
+    """  
+    fmt = np.lib.format  
+    with open(path, "r+b") as f:  
+        version = fmt.read_magic(f)  
+        prefix = f.tell() + (2 if version == (1, 0) else 4)  
+        if version == (1, 0):  
+            shape, fortran, dtype = fmt.read_array_header_1_0(f)  
+        else:  
+            shape, fortran, dtype = fmt.read_array_header_2_0(f)  
+        offset = f.tell()  
+        new_shape = (rows,) + tuple(shape[1:])  
+        header = "{'descr': %r, 'fortran_order': %r, 'shape': %r, }" % (  
+            fmt.dtype_to_descr(dtype), fortran, new_shape)  
+        header = header.ljust(offset - prefix - 1) + "\n"  
+        f.seek(prefix)  
+        f.write(header.encode("latin1"))  
+        f.truncate(offset + rows * int(np.prod(shape[1:])) * dtype.itemsize)  
+  
+def load_trajectory(path, mode="r"):  
+    """Reopen a trajectory written via `trajectory_path`, without a copy."""  
+    return np.load(path, mmap_mode=mode)  
+  
+def run_pi0_pipeline(x0, A, W1, W2, eps, steps, dtype="float64",  
+                     trajectory_path=None, tol=None):  
     """  
     Execute a Pi0-System reasoning pipeline:  
     1. Vector updates for `steps` iterations  
     2. Lift final x to density ρ  
     3. Compute cumulative quantum correction over trajectory  
+  
+    The trajectory is written into a preallocated (steps, n) array of  
+    `dtype` (float32 or float64); pass `trajectory_path` to back it with  
+    a memory-mapped .npy file (see load_trajectory).  
+  
+    With `tol`, the run stops as soon as ||x_{t+1} − x_t||₂ ≤ tol and the  
+    trajectory is trimmed to the steps actually taken, on disk as well  
+    (see trim_trajectory). `residual` is the last step's ||x_{t+1} − x_t||₂.  
     """  
-    x = x0[:]  
+    engine = UpdateEngine(A, W1, W2, eps)  
+    x = np.array(x0, dtype=np.float64)  
+    prev = np.empty_like(x)  
     qc_total = 0.0  
-    trajectory = []  
+    residual = float("nan") if steps == 0 else 0.0  
+    trajectory = allocate_trajectory(steps, len(x), dtype, trajectory_path)  
+    iterations = 0  
     for t in range(steps):  
-        x = update_vector(x, A, W1, W2, eps)  
-        trajectory.append(x[:])  
-    rho = lift_density(x)  
-    # Sum quantum corrections over each prior density  
-    for x in trajectory:  
-        r = lift_density(x)  
-        qc_total += Q_correction(r, A, W1, W2, eps)  
+        prev[:] = x  
+        engine.step(x, out=x)  
+        trajectory[t] = x  
+        iterations = t + 1  
+        prev -= x  
+        residual = float(np.linalg.norm(prev))  
+        if tol is not None and residual <= tol:  
+            break  
+    if isinstance(trajectory, np.memmap):  
+        trajectory.flush()  
+        if iterations < steps:  
+            del trajectory  
+            trim_trajectory(trajectory_path, iterations)  
+            trajectory = load_trajectory(trajectory_path, "r+")  
+    else:  
+        trajectory = trajectory[:iterations]  
+    # Sum quantum corrections over each prior density ρ_t = diag(x_t)  
+    qc_total += float(q_correction_batch(trajectory, A, W1, W2, eps).sum())  
     return {  
-        "final_state": x,  
+        "final_state": x.tolist(),  
         "quantum_penalty": qc_total,  
-        "trajectory": trajectory  
+        "trajectory": trajectory,  
+        "iterations": iterations,  
+        "residual": residual  
     }  
   
+def solve_pi0_attractor(x0, A, W1, W2, eps, tol=1e-10, max_iter=10000,  
+                        accel=None, m=5):  
+    """  
+    Solve for the attractor x* = M(x* + N(L(x*)) + C(x*)) directly.  
+    accel: None, "anderson" (history depth m) or "aitken"; see fixed_point.  
+    Returns final_state, iterations (operator applications), residual and  
+    converged.  
+    """  
+    engine = UpdateEngine(A, W1, W2, eps)  
+    result = solve_fixed_point(engine.step, x0, tol=tol, max_iter=max_iter,  
+                               accel=accel, m=m)  
+    result["final_state"] = result.pop("state").tolist()  
+    return result  
+  
+def stream_pi0_pipeline(x0, A, W1, W2, eps, steps):  
+    """  
+    Generator form of run_pi0_pipeline.  
+    Yields one record per step as soon as the state is produced:  
+      {"step", "state", "quantum_penalty", "score"}  
+    where quantum_penalty and score (consciousness_score) are running  
+    totals accumulated online, so memory stays O(n) for any `steps`.  
+    """  
+    engine = UpdateEngine(A, W1, W2, eps)  
+    x = np.array(x0, dtype=np.float64)  
+    qc_total = 0.0  
+    score = 0.0  
+    for t in range(steps):  
+        engine.step(x, out=x)  
+        qc_total += q_correction_diagonal(x, eps)  
+        score += state_entropy(x)  
+        yield {  
+            "step": t,  
+            "state": x.copy(),  
+            "quantum_penalty": qc_total,  
+            "score": score  
+        }  
+  
 # — 4Sight Introspection —   
+def state_entropy(x):  
+    """  
+    Shannon entropy of the density diag(x), x normalized to probabilities.  
+    A 2-D x gives one entropy per row.  
+    """  
+    x = np.asarray(x, dtype=np.float64)  
+    s = x.sum(axis=-1, keepdims=True) + 1e-12  
+    p = np.maximum(x / s, 1e-12)  
+    h = -(p * np.log(p)).sum(axis=-1)  
+    return float(h) if h.ndim == 0 else h  
+  
 def consciousness_score(trajectory):  
     """  
     Pi0-Consciousness meta-operator:  
       Sum of Shannon entropies of each density diag(x)  
+    Accepts any iterable of states, including stream_pi0_pipeline records.  
     """  
-    import math  
     score = 0.0  
     for x in trajectory:  
-        # normalize x to probabilities  
-        s = sum(x) + 1e-12  
-        for xi in x:  
-            p = max(xi/s, 1e-12)  
-            score -= p*math.log(p)  
+        if isinstance(x, dict):  
+            x = x["state"]  
+        score += state_entropy(x)  
     return score  
   
 def pi0_system_demo():  
@@ -12,11 +12,14 @@ import hmac
 import hashlib  
 import time  
   
+from lcg_ops import advance_dna, dna_at  
+  
 class Pi0KernelCore:  
     def __init__(self, name='Pi0Kernel'):  
         self.name = name  
         self.generation = 0  
         self.dna = {'pi': 3141592653589793, 'phi': 1618033988749895}  
+        self.seed_dna = dict(self.dna)  
         self.memory = []  
   
     def iterate(self):  
@@ -27,6 +30,17 @@ class Pi0KernelCore:
         self.memory.append(snapshot)  
         return snapshot  
   
+    def advance(self, k):  
+        # Jump k generations in O(log k); only the landing one is recorded  
+        if k:  
+            self.dna = advance_dna(self.dna, k)  
+            self.generation += k  
+            self.memory.append({'gen': self.generation, 'dna': dict(self.dna)})  
+        return {'gen': self.generation, 'dna': dict(self.dna)}  
+  
+    def dna_at(self, generation):  
+        return dna_at(self.seed_dna, self.dna, self.generation, generation)  
+  
     def export(self):  
         return {  
             'name': self.name,  
@@ -1,12 +1,25 @@
 import hashlib  
 import hmac  
+import os  
+import tempfile  
+  
+from history_log import SpillingLog  
   
 class USSKernel:  
-    def __init__(self, name='USSKernel', secret_key='defaultsecret'):  
+    def __init__(self, name='USSKernel', secret_key='defaultsecret', retain=1024,  
+                 spill_dir=None):  
         self.name = name  
         self.protocol = 'USS-Quantum'  
-        self.audit_log = []  
-        self.memory = []  
+        # Newest `retain` packets in RAM, older ones spilled under a fresh  
+        # subdirectory of spill_dir, so a restart never reloads old packets  
+        if spill_dir:  
+            os.makedirs(spill_dir, exist_ok=True)  
+            spill_dir = tempfile.mkdtemp(prefix=name + '-', dir=spill_dir)  
+        self.spill_dir = spill_dir  
+        self.audit_log = SpillingLog(  
+            retain, os.path.join(spill_dir, 'audit_log') if spill_dir else None, key='timestamp')  
+        self.memory = SpillingLog(  
+            retain, os.path.join(spill_dir, 'memory') if spill_dir else None, key='timestamp')  
         self._counter = 0  
         # Secret key for HMAC and XOR cipher (bytes)  
         self.secret_key = secret_key.encode('utf-8')  
@@ -85,6 +98,11 @@ class USSKernel:
             'memory': list(self.memory)  
         }  
   
+    def close(self):  
+        """Close both logs; temporary spill files are deleted."""  
+        self.audit_log.close()  
+        self.memory.close()  
+  
 # ASCII Table: USSKernel Security Steps  
 security_table = """  
 ┌─────────┬───────────────────────────────────────────────┐  
@@ -0,0 +1,92 @@
+"""Batched NumPy engine for the L/N/C/M vector update."""
+
+import numpy as np
+
+from sparse_ops import as_sparse, is_sparse
+
+
+class UpdateEngine:
+    """
+    Vectorized x → M(x + N(L(x)) + C(x)) over a (batch, n) block of states.
+
+    States are rows, so every operator becomes a right-multiplication:
+      L(x) = x·A,  W·x = x·Wᵀ
+    A may be a sparse_ops.SparseAdjacency (or scipy.sparse matrix), in
+    which case L costs O(batch·nnz) and A is never densified.
+    Weights are converted once (float64 arrays are used as-is, transposes
+    are views) and scratch buffers are kept per batch size, so repeated
+    steps are BLAS matmuls with no per-step temporaries. `eps` may be a
+    scalar or a (batch,) array giving each row its own collapse strength.
+    """
+
+    def __init__(self, A, W1, W2, eps, dtype=np.float64, eps_norm=1e-12):
+        self.dtype = np.dtype(dtype)
+        self.sparse = is_sparse(A)
+        if self.sparse:
+            self.A = as_sparse(A)
+        else:
+            self.A = np.asarray(A, dtype=self.dtype)
+        self.W1t = np.asarray(W1, dtype=self.dtype).T
+        self.W2t = np.asarray(W2, dtype=self.dtype).T
+        self.n = self.W1t.shape[0]
+        if np.ndim(eps) == 0:
+            self.eps = float(eps)
+        else:
+            self.eps = np.asarray(eps, dtype=self.dtype).reshape(-1, 1)
+        self.eps_norm = float(eps_norm)
+        self._buffers = {}
+
+    def _workspace(self, batch: int):
+        ws = self._buffers.get(batch)
+        if ws is None:
+            shape = (batch, self.n)
+            ws = (np.empty(shape, dtype=self.dtype),   # L(x)
+                  np.empty(shape, dtype=self.dtype),   # ReLU(W1·L(x))
+                  np.empty(shape, dtype=self.dtype),   # x⊙x
+                  np.empty(batch, dtype=self.dtype))   # ||y||²
+            self._buffers[batch] = ws
+        return ws
+
+    def step(self, X, out=None) -> np.ndarray:
+        """
+        One update of every row of X. `out` may alias X for in-place stepping.
+        A 1-D X is treated as a batch of one and a 1-D result is returned.
+        """
+        X = np.asarray(X, dtype=self.dtype)
+        single = X.ndim == 1
+        X2 = X.reshape(1, -1) if single else X
+        d, h, c, norm = self._workspace(X2.shape[0])
+        if out is None:
+            out = np.empty_like(X2)
+        else:
+            out = out.reshape(X2.shape)
+        # Everything that reads X happens before `out` is written.
+        if self.sparse:
+            self.A.rmatmat(X2, out=d)
+        else:
+            np.matmul(X2, self.A, out=d)
+        np.multiply(X2, X2, out=c)
+        np.matmul(d, self.W1t, out=h)
+        np.maximum(h, 0.0, out=h)
+        np.matmul(h, self.W2t, out=out)
+        out += d
+        c *= self.eps
+        out -= c
+        # M: row-wise x / sqrt(eps_norm + Σx²)
+        np.einsum('ij,ij->i', out, out, out=norm)
+        norm += self.eps_norm
+        np.sqrt(norm, out=norm)
+        out /= norm[:, None]
+        return out[0] if single else out
+
+    def run(self, X, steps: int) -> np.ndarray:
+        """Advance a copy of X by `steps` updates, in place on one buffer."""
+        X = np.array(X, dtype=self.dtype)
+        for _ in range(steps):
+            self.step(X, out=X)
+        return X
+
+
+def update_batch(X, A, W1, W2, eps):
+    """One update step for every row of a (batch, n) array of states."""
+    return UpdateEngine(A, W1, W2, eps).step(X)
@@ -0,0 +1,162 @@
+"""
+Benchmark suite for the L/N/C/M and quantum-calculus operators.
+
+Sweeps n (and batch size, for the batched engines) over every backend in
+op_registry, reporting throughput and peak traced memory. Results can be
+saved as a JSON baseline and later runs compared against it:
+
+    python bench_ops.py --save bench_baseline.json
+    python bench_ops.py --compare bench_baseline.json --threshold 0.25
+
+A comparison exits with status 1 when any case is slower than the
+baseline by more than `threshold` (as a fraction).
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import op_registry
+from batch_ops import UpdateEngine
+from density_ops import q_correction_batch
+
+DEFAULT_SIZES = [4, 16, 64, 256, 1024, 4096]
+DEFAULT_BATCHES = [1, 16, 256]
+
+
+def _registry_case(name, backend):
+    func = op_registry.get(name, backend)
+
+    def make(n, batch):
+        args = op_registry.sample_args(name, n)
+        if args is None:
+            return None
+        return lambda: func(*args)
+    return make
+
+
+def _weights(n):
+    # A, W1, W2 as the registry calibrates update_vector with
+    _, A, W1, W2, _ = op_registry.sample_args('update_vector', n)
+    return np.asarray(A), np.asarray(W1), np.asarray(W2)
+
+
+def _engine_case(n, batch):
+    engine = UpdateEngine(*_weights(n), 0.01)
+    X = np.random.default_rng(2).random((batch, n))
+    return lambda: engine.step(X, out=X)
+
+
+def _q_batch_case(n, batch):
+    A, W1, W2 = _weights(n)
+    T = np.random.default_rng(3).random((batch, n))
+    return lambda: q_correction_batch(T, A, W1, W2, 0.01)
+
+
+def cases():
+    """(operator, backend, batched, make(n, batch) -> zero-arg callable)"""
+    out = []
+    for name in op_registry.names():
+        for backend in op_registry.backends(name):
+            out.append((name, backend, False, _registry_case(name, backend)))
+    out.append(('update_vector', 'engine', True, _engine_case))
+    out.append(('Q_correction', 'trajectory', True, _q_batch_case))
+    return out
+
+
+def measure(fn, min_time=0.05):
+    """Best-of seconds per call, and peak traced bytes of one call."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    first = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    best, spent = first, first
+    while spent < min_time:
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        best = min(best, dt)
+        spent += dt
+    return best, peak
+
+
+def run(sizes=DEFAULT_SIZES, batches=DEFAULT_BATCHES, max_call=1.0,
+        only=None, log=print):
+    """
+    Run every case; a (operator, backend) pair whose single call exceeded
+    `max_call` seconds is skipped at all larger n; operators registered
+    without a sample input are skipped entirely.
+    """
+    results = {}
+    for name, backend, batched, make in cases():
+        if only and name not in only:
+            continue
+        for batch in (batches if batched else [1]):
+            for n in sizes:
+                fn = make(n, batch)
+                if fn is None:
+                    break
+                seconds, peak = measure(fn)
+                key = f"{name}/{backend}/n={n}/batch={batch}"
+                results[key] = {
+                    "seconds": seconds,
+                    "states_per_s": batch / seconds,
+                    "peak_bytes": peak,
+                }
+                log(f"{key:48s} {seconds * 1e3:12.4f} ms "
+                    f"{batch / seconds:14.1f} states/s {peak / 2**20:10.2f} MiB")
+                if seconds > max_call:
+                    break
+    return results
+
+
+def compare(results, baseline, threshold=0.25):
+    """Keys whose time grew by more than `threshold` relative to baseline."""
+    regressions = []
+    for key, base in baseline.items():
+        cur = results.get(key)
+        if cur is None:
+            continue
+        ratio = cur["seconds"] / base["seconds"]
+        if ratio > 1.0 + threshold:
+            regressions.append((key, ratio))
+    return regressions
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    p.add_argument('--batches', type=int, nargs='+', default=DEFAULT_BATCHES)
+    p.add_argument('--ops', nargs='+', default=None,
+                   help='restrict to these operator names')
+    p.add_argument('--max-call', type=float, default=1.0,
+                   help='stop growing n once one call takes this many seconds')
+    p.add_argument('--save', help='write results as a JSON baseline')
+    p.add_argument('--compare', help='JSON baseline to check against')
+    p.add_argument('--threshold', type=float, default=0.25,
+                   help='allowed slowdown fraction before flagging')
+    args = p.parse_args(argv)
+
+    results = run(args.sizes, args.batches, args.max_call, args.ops)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for key, ratio in regressions:
+            print(f"REGRESSION {key}: {ratio:.2f}x baseline")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
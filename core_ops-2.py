@@ -1,5 +1,7 @@
 # core_ops.py  
   
+from batch_ops import UpdateEngine  
+  
 # Drift: A^T x  
 def drift(x, A):  
     n = len(x)  
@@ -42,10 +44,6 @@ def normalize(x):
     norm = math.sqrt(sum(v*v for v in x)) + 1e-12  
     return [v/norm for v in x]  
   
-# One update step  
+# One update step (list wrapper over batch_ops.UpdateEngine)  
 def update(x, A, W1, W2, eps):  
-    d = drift(x, A)  
-    e = expand(d, W1, W2)  
-    c = collapse(x, eps)  
-    y = [d_i + e_i + c_i for d_i,e_i,c_i in zip(d,e,c)]  
-    return normalize(y)  
\ No newline at end of file
+    return UpdateEngine(A, W1, W2, eps).step(x).tolist()  
\ No newline at end of file
@@ -2,8 +2,12 @@
   
 import math  
   
-def drift(x, A):  
-    """L[x] = Aᵀ · x  (graph drift)"""  
+from sparse_ops import as_sparse, is_sparse  
+  
+def drift_py(x, A):  
+    """L[x] = Aᵀ · x  (graph drift); O(nnz) for a sparse A (SparseAdjacency or scipy.sparse)"""  
+    if is_sparse(A):  
+        return as_sparse(A).rmatvec(x)  
     n = len(x)  
     out = [0.0]*n  
     for i in range(n):  
@@ -13,7 +17,7 @@ def drift(x, A):
         out[i] = s  
     return out  
   
-def expand(x, W1, W2):  
+def expand_py(x, W1, W2):  
     """N[x] = W2 · ReLU(W1 · x)  (nonlinear expansion)"""  
     n = len(x)  
     # W1·x  
@@ -32,11 +36,11 @@ def expand(x, W1, W2):
         out[i] = s  
     return out  
   
-def collapse(x, eps):  
+def collapse_py(x, eps):  
     """C[x] = -ε · (x⊙x)  (superposition penalty)"""  
     return [-eps*(xi*xi) for xi in x]  
   
-def normalize(x, eps_norm=1e-12):  
+def normalize_py(x, eps_norm=1e-12):  
     """M[x] = x/||x||₂  (stability)"""  
     sum_sq = eps_norm  
     for xi in x:  
@@ -44,10 +48,35 @@ def normalize(x, eps_norm=1e-12):
     norm = math.sqrt(sum_sq)  
     return [xi/norm for xi in x]  
   
-def update_vector(x, A, W1, W2, eps):  
+def update_vector_py(x, A, W1, W2, eps):  
     """One update step: x → M(x + N(L(x)) + C(x))"""  
-    d = drift(x, A)  
-    e = expand(d, W1, W2)  
-    c = collapse(x, eps)  
+    d = drift_py(x, A)  
+    e = expand_py(d, W1, W2)  
+    c = collapse_py(x, eps)  
     y = [d_i + e_i + c_i for d_i,e_i,c_i in zip(d,e,c)]  
-    return normalize(y)  
\ No newline at end of file
+    return normalize_py(y)  
+  
+# — Public primitives: fastest registered backend (see op_registry) —   
+def _call(name, *args, **kwargs):  
+    from op_registry import call  
+    return call(name, *args, **kwargs)  
+  
+def drift(x, A):  
+    """L[x] = Aᵀ·x"""  
+    return _call('drift', x, A)  
+  
+def expand(x, W1, W2):  
+    """N[x] = W2·ReLU(W1·x)"""  
+    return _call('expand', x, W1, W2)  
+  
+def collapse(x, eps):  
+    """C[x] = -ε·(x⊙x)"""  
+    return _call('collapse', x, eps)  
+  
+def normalize(x, eps_norm=1e-12):  
+    """M[x] = x/||x||₂"""  
+    return _call('normalize', x, eps_norm)  
+  
+def update_vector(x, A, W1, W2, eps):  
+    """One step: x → M(x + N(L(x)) + C(x))"""  
+    return _call('update_vector', x, A, W1, W2, eps)  
\ No newline at end of file
@@ -2,26 +2,330 @@
 
 import numpy as np
 
+def periodic_laplacian(arr: np.ndarray, out: np.ndarray = None, axes=None) -> np.ndarray:
+    """Σ over `axes` of (x[i+1] + x[i−1] − 2x[i]) with periodic wrap, written into out."""
+    axes = range(arr.ndim) if axes is None else list(axes)
+    if out is None:
+        out = np.empty_like(arr)
+    np.multiply(arr, -2.0 * len(axes), out=out)
+    for axis in axes:
+        def sl(start, stop):
+            return (slice(None),) * axis + (slice(start, stop),)
+        lo, hi = sl(None, -1), sl(1, None)
+        first, last = sl(0, 1), sl(-1, None)
+        # neighbour at i+1, then at i−1, each with periodic wrap
+        np.add(out[lo], arr[hi], out=out[lo])
+        np.add(out[last], arr[first], out=out[last])
+        np.add(out[hi], arr[lo], out=out[hi])
+        np.add(out[first], arr[last], out=out[first])
+    return out
+
+def slab_laplacian(block: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Laplacian of the slab block[1:-1], where block[0] and block[-1] are halo
+    planes along axis 0 and all other axes are periodic within the slab.
+    """
+    core = block[1:-1]
+    periodic_laplacian(core, out, range(1, block.ndim))
+    out -= core
+    out -= core
+    out += block[2:]
+    out += block[:-2]
+    return out
+
+def laplacian_symbol(shape) -> np.ndarray:
+    """
+    Eigenvalues λ of the periodic Laplacian on the rfftn grid of `shape`:
+    λ = Σ_axes (2·cos(2πm/N) − 2).
+    """
+    lam = np.zeros([1] * len(shape))
+    for axis, n in enumerate(shape):
+        m = np.arange(n // 2 + 1 if axis == len(shape) - 1 else n)
+        term = 2.0 * np.cos(2.0 * np.pi * m / n) - 2.0
+        lam = lam + term.reshape([-1 if a == axis else 1 for a in range(len(shape))])
+    return lam
+
+class PointSource:
+    """
+    Sparse source in COO form: values[j] is added at lattice site coords[j].
+    coords is an (m, dim) integer array or a tuple of dim index arrays (as
+    returned by np.nonzero); repeated sites accumulate.
+    """
+
+    def __init__(self, coords, values):
+        if isinstance(coords, tuple):
+            coords = np.stack([np.asarray(c, dtype=np.intp) for c in coords], axis=-1)
+        self.coords = np.asarray(coords, dtype=np.intp).reshape(-1, np.shape(coords)[-1])
+        self.values = np.broadcast_to(np.asarray(values, dtype=float),
+                                      (len(self.coords),))
+
+    def apply(self, arr: np.ndarray, lo: int = 0):
+        """Scatter-add into arr, which holds planes [lo, lo + len(arr)) of the lattice."""
+        coords, values = self.coords, self.values
+        if lo or len(arr) < self.coords[:, 0].max(initial=-1) + 1:
+            keep = (coords[:, 0] >= lo) & (coords[:, 0] < lo + len(arr))
+            coords, values = coords[keep], values[keep]
+        index = (coords[:, 0] - lo,) + tuple(coords[:, 1:].T)
+        np.add.at(arr, index, values)
+        return arr
+
+    def to_dense(self, shape) -> np.ndarray:
+        return self.apply(np.zeros(shape))
+
+def as_source(source):
+    """None, a dense array, a PointSource, or a (coords, values) pair."""
+    if isinstance(source, tuple):
+        return PointSource(*source)
+    return source
+
+def add_source(arr: np.ndarray, source, lo: int = 0):
+    """Add a dense or PointSource source to planes [lo, lo + len(arr)) held in arr."""
+    if source is None:
+        return arr
+    if isinstance(source, PointSource):
+        return source.apply(arr, lo)
+    if lo or len(arr) != len(source):
+        source = source[lo:lo + len(arr)]
+    arr += source
+    return arr
+
 class HyperdimensionalCube:
-    def __init__(self, dimensions: int, size: int, Lp2: float):
+    # Steps taken so far; time-varying sources are called with this value.
+    t = 0
+    # rfftn of info, cached for step_spectral; dropped with the info Laplacian
+    _info_hat = None
+    # float64 shadow of a sampled block, set up by track_drift()
+    _shadow = None
+    # Largest |state − shadow| over the sampled block: after the last step,
+    # and over the whole run since track_drift() was called
+    drift = None
+    max_drift = None
+
+    def __init__(self, dimensions: int, size: int, Lp2: float,
+                 dtype=float, accumulate=None):
+        """
+        `dtype` is the storage type of state and info. `accumulate` is the
+        type the stencil is evaluated in (defaults to `dtype`); float32
+        storage with accumulate=np.float64 halves memory while keeping the
+        per-step sum in double precision, rounding once on store.
+        """
         self.dim = dimensions
         self.size = size
         self.Lp2 = Lp2
-        self.state = np.zeros((size,) * dimensions, dtype=float)
-        self.info = np.zeros_like(self.state)
+        self.state = np.zeros((size,) * dimensions, dtype=dtype)
+        self._info = np.zeros_like(self.state)
+        self._alloc_scratch(accumulate)
+
+    def _alloc_scratch(self, accumulate=None):
+        # Scratch for the state Laplacian and the cached Lp2·∇²info term
+        acc = np.dtype(accumulate or self.state.dtype)
+        self._lap = np.empty(self.state.shape, dtype=acc)
+        self._info_term = np.empty(self.state.shape, dtype=acc)
+        self._info_term_Lp2 = None
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.state.dtype
+
+    @property
+    def accumulate(self) -> np.dtype:
+        return self._info_term.dtype
+
+    @classmethod
+    def from_arrays(cls, state: np.ndarray, info: np.ndarray, Lp2: float, t: int = 0,
+                    accumulate=None):
+        """Wrap existing state/info arrays (e.g. np.memmap views) without copying."""
+        cube = cls.__new__(cls)
+        cube.dim = state.ndim
+        cube.size = state.shape[0]
+        cube.Lp2 = Lp2
+        cube.state = state
+        cube._info = info
+        cube._alloc_scratch(accumulate)
+        cube.t = t
+        return cube
+
+    @property
+    def info(self) -> np.ndarray:
+        """
+        Read-only view of the info field. The Lp2·∇²info coupling is cached
+        across steps, so writes must go through the setter, update_info()
+        or be followed by mark_info_dirty().
+        """
+        view = self._info.view()
+        view.flags.writeable = False
+        return view
+
+    @info.setter
+    def info(self, value: np.ndarray):
+        # Copied into the existing buffer, which may be shared or mapped
+        self.update_info(value)
 
-    def laplacian(self, arr: np.ndarray) -> np.ndarray:
-        out = np.zeros_like(arr)
+    def update_info(self, value, index=Ellipsis):
+        """Write `value` into info[index] and drop the cached coupling."""
+        self._info[index] = value
+        self.mark_info_dirty()
+
+    def mark_info_dirty(self):
+        """Call after writing into the info buffer by any other route."""
+        self._info_term_Lp2 = None
+        self._info_hat = None
+
+    def laplacian(self, arr: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Periodic 2·dim-point Laplacian (same result as the np.roll form),
+        built from shifted slice views so no full-size temporaries are made.
+        """
+        return periodic_laplacian(arr, out, range(self.dim))
+
+    def _info_coupling(self) -> np.ndarray:
+        if self._info_term_Lp2 != self.Lp2:
+            self.laplacian(self._info, out=self._info_term)
+            self._info_term *= self.Lp2
+            self._info_term_Lp2 = self.Lp2
+        return self._info_term
+
+    def track_drift(self, block: int = 8, origin=None):
+        """
+        Start estimating precision drift. A block of `block` sites per axis
+        (at `origin`, default the lattice centre, wrapping periodically) is
+        copied to float64 and stepped alongside the lattice by step() and
+        step_n(); after each step, drift = max |state − shadow| over the
+        block and max_drift is its running maximum.
+
+        The shadow reads its one-site halo from the lattice itself, so it
+        measures the rounding accumulated inside the block rather than the
+        whole-lattice error, which for diffusion is the dominant, local
+        part. Calling it again re-seeds the shadow from the current state.
+        """
+        block = min(block, self.size)
+        if origin is None:
+            origin = ((self.size - block) // 2,) * self.dim
+        # Index vectors of the block plus one halo site on each side
+        self._shadow_index = [(o + np.arange(-1, block + 1)) % self.size for o in origin]
+        self._shadow = self.state[self._shadow_sites(inner=True)].astype(np.float64)
+        self._shadow_origin = tuple(origin)
+        self.drift = 0.0
+        self.max_drift = 0.0
+
+    def _shadow_sites(self, inner=False):
+        index = [i[1:-1] for i in self._shadow_index] if inner else self._shadow_index
+        return np.ix_(*index)
+
+    def _block_laplacian(self, halo: np.ndarray) -> np.ndarray:
+        # Laplacian of halo[1:-1, …, 1:-1] from its one-site border
+        core = (slice(1, -1),) * self.dim
+        out = halo[core] * (-2.0 * self.dim)
         for axis in range(self.dim):
-            rolled_p = np.roll(arr, -1, axis=axis)
-            rolled_m = np.roll(arr, +1, axis=axis)
-            out += rolled_p + rolled_m - 2 * arr
+            for shift in (slice(2, None), slice(None, -2)):
+                out += halo[core[:axis] + (shift,) + core[axis + 1:]]
         return out
 
-    def step(self, D: float, source: np.ndarray = None):
-        lap = self.laplacian(self.state)
-        lapI = self.laplacian(self.info)
-        self.state += D * lap + self.Lp2 * lapI
+    def _shadow_source(self, source):
+        if source is None:
+            return None
+        if isinstance(source, PointSource):
+            n = len(self._shadow_index[0]) - 2
+            local = (source.coords - self._shadow_origin) % self.size
+            keep = (local < n).all(axis=1)
+            out = np.zeros(self._shadow.shape)
+            np.add.at(out, tuple(local[keep].T), source.values[keep])
+            return out
+        return np.asarray(source, dtype=np.float64)[self._shadow_sites(inner=True)]
+
+    def _advance_shadow(self, D: float, source):
+        # float64 step of the shadow block against the pre-step lattice
+        core = (slice(1, -1),) * self.dim
+        halo = self.state[self._shadow_sites()].astype(np.float64)
+        halo[core] = self._shadow
+        update = self._block_laplacian(halo)
+        update *= D
+        info = self._info[self._shadow_sites()].astype(np.float64)
+        update += self.Lp2 * self._block_laplacian(info)
+        self._shadow += update
+        src = self._shadow_source(source)
+        if src is not None:
+            self._shadow += src
+
+    def _measure_drift(self):
+        diff = np.abs(self.state[self._shadow_sites(inner=True)] - self._shadow)
+        self.drift = float(diff.max()) if diff.size else 0.0
+        self.max_drift = max(self.max_drift, self.drift)
+
+    def step(self, D: float, source=None):
+        """
+        One explicit step. `source` may be a dense array, a PointSource or
+        a (coords, values) pair; sparse sources are scatter-added.
+        """
+        source = as_source(source)
+        if self._shadow is not None:
+            self._advance_shadow(D, source)
+        lap = self.laplacian(self.state, out=self._lap)
+        lap *= D
+        lap += self._info_coupling()
+        if lap.dtype != self.state.dtype:
+            # Sum at accumulation precision, round once on store
+            lap += self.state
+            add_source(lap, source)
+            self.state[...] = lap
+        else:
+            self.state += lap
+            add_source(self.state, source)
+        self.t += 1
+        if self._shadow is not None:
+            self._measure_drift()
+        return self.state
+
+    def step_n(self, k: int, D: float, source=None):
+        """
+        Advance k steps; after the first, no arrays are allocated.
+        `source` may also be a schedule: a callable t -> source, called
+        with the absolute step number before each step.
+        """
+        if callable(source):
+            for _ in range(k):
+                self.step(D, source(self.t))
+            return self.state
+        source = as_source(source)
+        for _ in range(k):
+            self.step(D, source)
+        return self.state
+
+    def step_spectral(self, k: int, D: float, source: np.ndarray = None):
+        """
+        Advance k explicit steps in one FFT round trip.
+
+        step() is the affine map s ← (1 + D·L)s + g with the constant
+        g = Lp2·L(info) + source, and L is diagonal in Fourier space with
+        eigenvalues λ (laplacian_symbol). With μ = 1 + D·λ, k steps give
+          ŝ_k = μ^k·ŝ_0 + (1 + μ + … + μ^{k−1})·ĝ,
+        the geometric sum being (1 − μ^k)/(1 − μ), or k where μ = 1.
+        The result equals step_n(k) up to rounding, including the blow-up
+        when D > 1/(2·dim).
+        """
+        shape = self.state.shape
+        lam = laplacian_symbol(shape)
+        mu = 1.0 + D * lam
+        mu_k = mu ** k
+        den = -D * lam
+        flat = den == 0.0
+        geom = np.where(flat, float(k), (1.0 - mu_k) / np.where(flat, 1.0, den))
+        if self._info_hat is None:
+            self._info_hat = np.fft.rfftn(self._info)
+        g_hat = (self.Lp2 * lam) * self._info_hat
+        source = as_source(source)
+        if callable(source):
+            raise ValueError('step_spectral needs a constant source')
+        if isinstance(source, PointSource):
+            source = source.to_dense(shape)
         if source is not None:
-            self.state += source
+            g_hat = g_hat + np.fft.rfftn(source)
+        s_hat = np.fft.rfftn(self.state)
+        s_hat *= mu_k
+        s_hat += geom * g_hat
+        self.state[...] = np.fft.irfftn(s_hat, s=shape, axes=range(self.dim))
+        self.t += k
+        if self._shadow is not None:
+            # the shadow cannot follow the spectral jump; re-seed it here
+            self._shadow = self.state[self._shadow_sites(inner=True)].astype(np.float64)
         return self.state
@@ -0,0 +1,219 @@
+"""Checkpoint/restart for HyperdimensionalCube runs."""
+
+import hashlib
+import json
+import mmap
+import os
+
+import numpy as np
+
+from cube import HyperdimensionalCube
+
+FORMAT = 'pi0cube-raw-v2'
+FORMATS = ('pi0cube-raw-v1', FORMAT)  # v1: field files directly under path
+SLOTS = ('slot-0', 'slot-1')
+FIELDS = ('state', 'info')
+PAGE = mmap.PAGESIZE
+
+
+def _padded(nbytes):
+    return -(-nbytes // PAGE) * PAGE
+
+
+def _fsync_dir(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Checkpointer:
+    """
+    Writes a cube to `path` as raw, page-aligned field files plus meta.json:
+
+      slot-0/, slot-1/      state.bin and info.bin: C-order array bytes at
+                            offset 0, file length padded to a page
+                            multiple, so load_checkpoint can np.memmap
+                            them back with no copy
+      meta.json             active slot, shape, dtype, accumulate, Lp2,
+                            step count t, extra params
+
+    The two slots are double-buffered: a save only ever writes the slot
+    meta.json does not name, then replaces meta.json atomically to switch
+    over, so a crash at any point leaves the previous checkpoint intact.
+
+    The first save() writes everything. Later saves rewrite only slabs of
+    `tile_planes` planes along axis 0 that changed since the last save by
+    more than `threshold` (0.0 means any change), plus the slabs the
+    target slot missed at the save before, copied over from the active
+    slot. Changes are found in memory, never by reading the checkpoint
+    back: with threshold 0.0 from a per-slab digest, otherwise against a
+    copy of the saved fields. With threshold > 0 the checkpoint is
+    accurate to within `threshold` per site, but that copy doubles the
+    memory of state and info, so the mode is for in-RAM cubes only;
+    memory-mapped cubes (e.g. OutOfCoreCube) must use threshold 0.0.
+
+    The cube must not step in the checkpoint's own files, or later steps
+    would overwrite the slot meta.json names; such cubes are refused.
+    """
+
+    def __init__(self, cube, path, tile_planes=None, threshold=0.0, params=None):
+        self.cube = cube
+        self.path = path
+        self.threshold = threshold
+        self.params = dict(params or {})
+        root = os.path.join(os.path.abspath(path), '')
+        for arr in (cube.state, cube._info):
+            fname = getattr(arr, 'filename', None)
+            writes_through = getattr(arr, 'mode', None) in ('r+', 'w+')
+            if writes_through and os.path.abspath(fname).startswith(root):
+                raise ValueError(f'cube steps in the checkpoint files under {path}; '
+                                 "load it with mode 'c' to checkpoint it again")
+        plane_bytes = cube.state[0].nbytes if cube.state.ndim > 1 else cube.state.itemsize
+        if tile_planes is None:
+            tile_planes = max(1, (4 << 20) // max(plane_bytes, 1))
+        self.tile_planes = min(tile_planes, cube.size)
+        self._active = None  # slot meta.json names, once this object saved
+        self._marks = {}     # field -> per-tile digest or saved copy
+        self._stale = {}     # slot -> {field: tiles behind the active slot}
+
+    def _tiles(self):
+        for a in range(0, self.cube.size, self.tile_planes):
+            yield a, min(a + self.tile_planes, self.cube.size)
+
+    def _tile_count(self):
+        return -(-self.cube.size // self.tile_planes)
+
+    def _file(self, slot, name):
+        return os.path.join(self.path, slot, name + '.bin')
+
+    def _open(self, slot, name, arr, fresh):
+        fname = self._file(slot, name)
+        if fresh or not os.path.exists(fname):
+            os.makedirs(os.path.dirname(fname), exist_ok=True)
+            with open(fname, 'wb') as f:
+                f.truncate(_padded(arr.nbytes))
+        return np.memmap(fname, dtype=arr.dtype, mode='r+', shape=arr.shape)
+
+    def _changed(self, name, arr):
+        """Tiles of `arr` that moved past the threshold since the last save."""
+        if self.threshold == 0.0:
+            marks = [hashlib.blake2b(np.ascontiguousarray(arr[a:b])).digest()
+                     for a, b in self._tiles()]
+            old = self._marks.get(name)
+            if not isinstance(old, list):
+                old = None
+            dirty = {i for i, m in enumerate(marks) if old is None or old[i] != m}
+            return dirty, marks
+        if isinstance(arr, np.memmap):
+            raise ValueError('threshold > 0 keeps an in-RAM copy of the fields; '
+                             'use threshold=0.0 for memory-mapped cubes')
+        saved = self._marks.get(name)
+        if not isinstance(saved, np.ndarray) or saved.shape != arr.shape or saved.dtype != arr.dtype:
+            return set(range(self._tile_count())), np.array(arr)
+        dirty = set()
+        for i, (a, b) in enumerate(self._tiles()):
+            diff = np.abs(np.subtract(arr[a:b], saved[a:b]))
+            if diff.size and float(diff.max()) > self.threshold:
+                saved[a:b] = arr[a:b]
+                dirty.add(i)
+        return dirty, saved
+
+    def _write(self, slot, name, arr, full):
+        # `changed` is what moved since the last save; a fresh slot file
+        # still gets every tile, but only `changed` makes the other slot lag
+        changed, marks = self._changed(name, arr)
+        full = full or not os.path.exists(self._file(slot, name))
+        dirty = set(range(self._tile_count())) if full else changed
+        mm = self._open(slot, name, arr, full)
+        stale = set() if full else self._stale.get(slot, {}).get(name, set())
+        src = None
+        if stale - dirty:
+            src = np.memmap(self._file(self._active, name), dtype=arr.dtype,
+                            mode='r', shape=arr.shape)
+        for i, (a, b) in enumerate(self._tiles()):
+            if i in dirty:
+                mm[a:b] = arr[a:b]
+            elif i in stale:
+                mm[a:b] = src[a:b]
+        mm.flush()
+        del mm, src
+        self._marks[name] = marks
+        return changed, len(dirty | stale)
+
+    def save(self, full=False):
+        """Write a (possibly incremental) checkpoint; returns tiles written."""
+        os.makedirs(self.path, exist_ok=True)
+        cube = self.cube
+        # Unknown disk contents (another writer, or none yet) mean a full save
+        known = self._active is not None
+        full = full or not known
+        active = self._active
+        if active is None and os.path.exists(os.path.join(self.path, 'meta.json')):
+            active = _read_meta(self.path).get('slot')
+        target = SLOTS[1 - SLOTS.index(active)] if active in SLOTS else SLOTS[0]
+        written, dirty = 0, {}
+        for name, arr in zip(FIELDS, (cube.state, cube._info)):
+            dirty[name], n = self._write(target, name, arr, full)
+            written += n
+        _fsync_dir(os.path.join(self.path, target))
+        meta = {
+            'format': FORMAT,
+            'slot': target,
+            'shape': list(cube.state.shape),
+            'dtype': cube.state.dtype.str,
+            'accumulate': cube.accumulate.str,
+            'Lp2': cube.Lp2,
+            't': cube.t,
+            'tile_planes': self.tile_planes,
+            'threshold': self.threshold,
+            'params': self.params,
+        }
+        tmp = os.path.join(self.path, 'meta.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.path, 'meta.json'))
+        _fsync_dir(self.path)
+        # The slot just left lags the new one exactly on this save's changed
+        # tiles; before this object's first save its contents are unknown
+        if not known:
+            dirty = {name: set(range(self._tile_count())) for name in FIELDS}
+        self._stale = {SLOTS[1 - SLOTS.index(target)]: dirty}
+        self._active = target
+        return written
+
+
+def save_checkpoint(cube, path, **kwargs):
+    """Full checkpoint of `cube` to `path`."""
+    return Checkpointer(cube, path, **kwargs).save(full=True)
+
+
+def load_checkpoint(path, mode='c'):
+    """
+    Restore a cube from `path` with state/info memory-mapped, not copied.
+    mode 'c' (copy-on-write) leaves the checkpoint untouched as the run
+    continues; 'r' maps it read-only. Returns (cube, meta).
+    """
+    if mode not in ('c', 'r'):
+        raise ValueError(f"mode must be 'c' or 'r', not {mode!r}: "
+                         'stepping in the checkpoint files would overwrite it')
+    meta = _read_meta(path)
+    if meta.get('format') not in FORMATS:
+        raise ValueError(f"Unknown checkpoint format: {meta.get('format')}")
+    shape, dtype = tuple(meta['shape']), np.dtype(meta['dtype'])
+    base = os.path.join(path, meta.get('slot', ''))
+    state = np.memmap(os.path.join(base, 'state.bin'), dtype=dtype, mode=mode, shape=shape)
+    info = np.memmap(os.path.join(base, 'info.bin'), dtype=dtype, mode=mode, shape=shape)
+    accumulate = meta.get('accumulate')
+    cube = HyperdimensionalCube.from_arrays(
+        state, info, meta['Lp2'], meta['t'],
+        accumulate=np.dtype(accumulate) if accumulate else None)
+    return cube, meta
+
+
+def _read_meta(path):
+    with open(os.path.join(path, 'meta.json')) as f:
+        return json.load(f)
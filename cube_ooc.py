@@ -0,0 +1,121 @@
+"""Out-of-core HyperdimensionalCube: fields in np.memmap files, stepped in tiles."""
+
+import os
+
+import numpy as np
+
+from cube import HyperdimensionalCube, add_source, as_source, slab_laplacian
+
+DEFAULT_MEMORY_BUDGET = 256 * 2**20  # bytes of RAM for tile buffers
+
+
+class OutOfCoreCube(HyperdimensionalCube):
+    """
+    HyperdimensionalCube whose `state`, `info` and cached info coupling live
+    in .npy files under `path`, opened as np.memmap.
+
+    step() walks the lattice in slabs of `tile` planes along axis 0. Each
+    slab is read with one halo plane on either side, updated in RAM and
+    written back in place, so RAM use is bounded by a few slabs and disk
+    access is sequential. The only extra state carried between slabs is
+    the old values of two planes (the next lower halo and the wrap plane 0).
+    """
+
+    def __init__(self, dimensions: int, size: int, Lp2: float, path: str,
+                 tile: int = None, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 mode: str = 'w+', dtype=float, accumulate=None):
+        self.dim = dimensions
+        self.size = size
+        self.Lp2 = Lp2
+        self.path = path
+        shape = (size,) * dimensions
+        os.makedirs(path, exist_ok=True)
+        self.state = self._open('state', mode, shape, dtype)
+        self._info = self._open('info', mode, shape, dtype)
+        # Slabs are stepped at `accumulate` precision and rounded on store
+        acc = np.dtype(accumulate or self.state.dtype)
+        self._info_term = self._open('info_term', 'w+', shape, acc)
+        self._info_term_Lp2 = None
+        plane_bytes = self.state[0].size * acc.itemsize
+        if tile is None:
+            # block (tile+2 planes) + result (tile planes) + spare halo planes
+            tile = max(1, memory_budget // (plane_bytes * 2) - 2)
+        self.tile = min(tile, size)
+        self._block = np.empty((self.tile + 2,) + shape[1:], dtype=acc)
+        self._out = np.empty((self.tile,) + shape[1:], dtype=acc)
+
+    @classmethod
+    def open(cls, path: str, Lp2: float, tile: int = None,
+             memory_budget: int = DEFAULT_MEMORY_BUDGET, accumulate=None):
+        """Reopen an existing out-of-core cube read-write."""
+        state = np.load(os.path.join(path, 'state.npy'), mmap_mode='r')
+        dimensions, size, dtype = state.ndim, state.shape[0], state.dtype
+        del state
+        return cls(dimensions, size, Lp2, path, tile, memory_budget, mode='r+',
+                   dtype=dtype, accumulate=accumulate)
+
+    def _open(self, name, mode, shape, dtype):
+        fname = os.path.join(self.path, name + '.npy')
+        if mode == 'w+':
+            return np.lib.format.open_memmap(fname, mode='w+', dtype=dtype, shape=shape)
+        return np.load(fname, mmap_mode=mode)
+
+    def update_info(self, value, index=Ellipsis):
+        """Write into the info memmap in place (never replaced) and flush it."""
+        super().update_info(value, index)
+        self._info.flush()
+
+    def step_spectral(self, k: int, D: float, source=None):
+        # rfftn would pull the whole lattice (and its spectrum) into RAM;
+        # k tiled steps give the same result in bounded memory
+        return self.step_n(k, D, source)
+
+    def _tiles(self):
+        for a in range(0, self.size, self.tile):
+            yield a, min(a + self.tile, self.size)
+
+    def _info_coupling(self) -> np.ndarray:
+        if self._info_term_Lp2 != self.Lp2:
+            info = self._info
+            for a, b in self._tiles():
+                t = b - a
+                block, out = self._block[:t + 2], self._out[:t]
+                block[0] = info[a - 1]
+                block[1:-1] = info[a:b]
+                block[-1] = info[b % self.size]
+                slab_laplacian(block, out)
+                out *= self.Lp2
+                self._info_term[a:b] = out
+            self._info_term.flush()
+            self._info_term_Lp2 = self.Lp2
+        return self._info_term
+
+    def step(self, D: float, source=None):
+        source = as_source(source)
+        if self._shadow is not None:
+            self._advance_shadow(D, source)
+        info_term = self._info_coupling()
+        state = self.state
+        wrap = np.array(state[0])     # old plane 0, upper halo of the last slab
+        halo = np.array(state[-1])    # old plane a−1 for the current slab
+        for a, b in self._tiles():
+            t = b - a
+            block, out = self._block[:t + 2], self._out[:t]
+            block[0] = halo
+            block[1:-1] = state[a:b]
+            block[-1] = state[b] if b < self.size else wrap
+            halo[...] = block[-2]
+            slab_laplacian(block, out)
+            out *= D
+            out += info_term[a:b]
+            out += block[1:-1]
+            add_source(out, source, a)
+            state[a:b] = out
+        self.t += 1
+        if self._shadow is not None:
+            self._measure_drift()
+        return state
+
+    def flush(self):
+        self.state.flush()
+        self._info.flush()
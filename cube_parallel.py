@@ -0,0 +1,248 @@
+"""Domain-decomposed parallel stepping of HyperdimensionalCube across processes."""
+
+import multiprocessing as mp
+import os
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cube import HyperdimensionalCube, PointSource, as_source, slab_laplacian
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _worker(w, a, b, specs, accumulate, barrier, conn):
+    """
+    Owns planes [a, b) of the lattice along axis 0. Per step it publishes
+    its two boundary planes to the halo buffer, waits on the barrier, reads
+    its neighbours' planes and updates its slab in place. The halo buffer
+    alternates between two halves by step parity, so one barrier per step
+    is enough: nobody can overwrite a half before every worker has read it.
+    """
+    handles = []
+    arrays = {}
+    for key, spec in specs.items():
+        shm, arr = _attach(spec)
+        handles.append(shm)
+        arrays[key] = arr
+    state, info, halo = arrays['state'], arrays['info'], arrays['halo']
+    size, W = state.shape[0], halo.shape[1]
+    t = b - a
+    block = np.empty((t + 2,) + state.shape[1:], dtype=accumulate)
+    out = np.empty((t,) + state.shape[1:], dtype=accumulate)
+    info_term = np.zeros_like(out)
+    parity = 0
+    while True:
+        msg = conn.recv()
+        if msg[0] == 'close':
+            break
+        _, k, D, Lp2, source_spec, point = msg
+        try:
+            if Lp2 is not None:
+                block[0] = info[a - 1]
+                block[1:-1] = info[a:b]
+                block[-1] = info[b % size]
+                slab_laplacian(block, info_term)
+                info_term *= Lp2
+            src = None
+            if source_spec is not None:
+                src_shm, src_arr = _attach(source_spec)
+                src = src_arr[a:b]
+            # Point sources arrive pre-split, in slab-local coordinates
+            point = PointSource(*point) if point is not None else None
+            for _ in range(k):
+                h = halo[parity]
+                h[w, 0] = state[a]
+                h[w, 1] = state[b - 1]
+                barrier.wait()
+                block[0] = h[(w - 1) % W, 1]
+                block[-1] = h[(w + 1) % W, 0]
+                block[1:-1] = state[a:b]
+                slab_laplacian(block, out)
+                out *= D
+                out += info_term
+                out += block[1:-1]
+                if src is not None:
+                    out += src
+                if point is not None:
+                    point.apply(out)
+                state[a:b] = out
+                parity ^= 1
+            if src is not None:
+                del src, src_arr
+                src_shm.close()
+            conn.send(('ok', None))
+        except Exception as exc:
+            barrier.abort()
+            conn.send(('error', repr(exc)))
+    del state, info, halo, arrays
+    for shm in handles:
+        shm.close()
+
+
+def _shutdown(procs, conns, shms):
+    """Stop workers and release shared memory; safe to call more than once."""
+    for conn in conns:
+        try:
+            conn.send(('close',))
+        except (OSError, ValueError):
+            pass
+    for p in procs:
+        p.join(timeout=5)
+        if p.is_alive():
+            p.terminate()
+    for shm in shms.values():
+        try:
+            shm.close()
+        except BufferError:
+            # arrays still view the buffer (e.g. at interpreter exit);
+            # the mapping goes with the process, the name is unlinked below
+            pass
+        shm.unlink()
+    procs.clear()
+    conns.clear()
+    shms.clear()
+
+
+class ParallelCube(HyperdimensionalCube):
+    """
+    HyperdimensionalCube stepped by `workers` processes, each owning a slab
+    of planes along axis 0. `state` and `info` live in shared memory, halo
+    planes are exchanged through a shared buffer each step, and periodic
+    wrap-around is the exchange between the first and last worker, so the
+    result matches the np.roll stencil exactly (up to summation order).
+    With track_drift() active, step_n dispatches one step at a time so the
+    float64 shadow block can follow the lattice.
+
+    Call close() (or use as a context manager) to stop the workers and
+    release the shared memory; otherwise this happens when the cube is
+    garbage-collected or at interpreter exit.
+    """
+
+    def __init__(self, dimensions: int, size: int, Lp2: float, workers: int = None,
+                 dtype=float, accumulate=None):
+        self.dim = dimensions
+        self.size = size
+        self.Lp2 = Lp2
+        self._dtype = np.dtype(dtype)
+        # Workers step their slabs at this precision and round on store
+        self._accumulate = np.dtype(accumulate or dtype)
+        self.workers = max(1, min(workers or os.cpu_count() or 1, size))
+        shape = (size,) * dimensions
+        self._shm = {}
+        self._procs = []
+        self._conns = []
+        # Holds the containers, not self, so the cube can still be collected
+        self._finalizer = weakref.finalize(self, _shutdown, self._procs,
+                                           self._conns, self._shm)
+        self.state = self._alloc('state', shape)
+        self._info = self._alloc('info', shape)
+        self._halo = self._alloc('halo', (2, self.workers, 2) + shape[1:])
+        self._shm_source = None
+        self._info_term_Lp2 = None
+        edges = np.linspace(0, size, self.workers + 1).astype(int)
+        self._bounds = list(zip(edges[:-1], edges[1:]))
+
+    @property
+    def accumulate(self) -> np.dtype:
+        return self._accumulate
+
+    def _alloc(self, name, shape):
+        nbytes = max(int(np.prod(shape)) * self._dtype.itemsize, 1)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._shm[name] = shm
+        arr = np.ndarray(shape, dtype=self._dtype, buffer=shm.buf)
+        arr[...] = 0.0
+        return arr
+
+    def _spec(self, name):
+        arr = {'state': self.state, 'info': self._info, 'halo': self._halo,
+               'source': self._shm_source}[name]
+        return (self._shm[name].name, arr.shape, arr.dtype.str)
+
+    def _start(self):
+        ctx = mp.get_context()
+        barrier = ctx.Barrier(self.workers)
+        specs = {k: self._spec(k) for k in ('state', 'info', 'halo')}
+        for w, (a, b) in enumerate(self._bounds):
+            parent, child = ctx.Pipe()
+            p = ctx.Process(target=_worker,
+                            args=(w, a, b, specs, self._accumulate.str, barrier, child),
+                            daemon=True)
+            p.start()
+            self._procs.append(p)
+            self._conns.append(parent)
+
+    def _run(self, msgs):
+        for conn, msg in zip(self._conns, msgs):
+            conn.send(msg)
+        errors = [r[1] for r in (conn.recv() for conn in self._conns) if r[0] == 'error']
+        if errors:
+            raise RuntimeError('ParallelCube worker failed: ' + errors[0])
+
+    def step(self, D: float, source=None):
+        return self.step_n(1, D, source)
+
+    def step_n(self, k: int, D: float, source=None):
+        if not self._finalizer.alive:
+            # Closed: step the private copies in this process
+            for _ in range(k):
+                HyperdimensionalCube.step(self, D, source(self.t) if callable(source) else source)
+            return self.state
+        if callable(source) or (self._shadow is not None and k > 1):
+            # Schedules and the drift shadow need the lattice between steps
+            for _ in range(k):
+                self.step_n(1, D, source(self.t) if callable(source) else source)
+            return self.state
+        source = as_source(source)
+        if self._shadow is not None:
+            self._advance_shadow(D, source)
+        if not self._procs:
+            self._start()
+        Lp2 = self.Lp2 if self._info_term_Lp2 != self.Lp2 else None
+        source_spec = None
+        points = [None] * self.workers
+        if isinstance(source, PointSource):
+            # O(m): each worker gets only its slab's sites, never a dense field
+            rows = source.coords[:, 0]
+            for w, (a, b) in enumerate(self._bounds):
+                keep = (rows >= a) & (rows < b)
+                if keep.any():
+                    coords = source.coords[keep].copy()
+                    coords[:, 0] -= a
+                    points[w] = (coords, np.array(source.values[keep]))
+        elif source is not None:
+            if 'source' not in self._shm:
+                self._shm_source = self._alloc('source', self.state.shape)
+            self._shm_source[...] = source
+            source_spec = self._spec('source')
+        self._run([('step', k, D, Lp2, source_spec, points[w])
+                   for w in range(self.workers)])
+        self._info_term_Lp2 = self.Lp2
+        self.t += k
+        if self._shadow is not None:
+            self._measure_drift()
+        return self.state
+
+    def close(self):
+        """
+        Stop the workers; state and info become private in-RAM copies,
+        which later steps advance in this process.
+        """
+        self.state = np.array(self.state)
+        self._info = np.array(self._info)
+        self._halo = None
+        self._shm_source = None
+        self._finalizer()
+        self._alloc_scratch(self._accumulate)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,116 @@
+"""
+Multi-core ensemble runner for Pi0 pipelines.
+
+Runs the run_pi0_pipeline recurrence for many (x0, eps) pairs against one
+shared A, W1, W2. The weights, the initial states, the eps values and the
+result array all live in multiprocessing.shared_memory, so workers attach
+to them by name and nothing large is ever pickled or copied per task.
+"""
+
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Pi0_Architecture import state_entropy
+from batch_ops import UpdateEngine
+from sparse_ops import as_sparse, is_sparse
+
+_SHARED = {}   # worker-side: name -> ndarray view on shared memory
+_HANDLES = []  # keeps SharedMemory objects alive in the worker
+_STEPS = 0
+
+
+def _share(arr):
+    arr = np.asarray(arr, dtype=np.float64)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    _HANDLES.append(shm)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _init_worker(specs, steps, sparse_A=None):
+    global _STEPS
+    _STEPS = steps
+    for key, spec in specs.items():
+        _SHARED[key] = _attach(spec)
+    if sparse_A is not None:
+        _SHARED['A'] = sparse_A
+
+
+def _run_chunk(bounds):
+    s, e = bounds
+    out = _SHARED['out']
+    n = _SHARED['x0'].shape[1]
+    X = np.array(_SHARED['x0'][s:e])
+    engine = UpdateEngine(_SHARED['A'], _SHARED['W1'], _SHARED['W2'],
+                          _SHARED['eps'][s:e])
+    penalty = np.zeros(e - s)
+    score = np.zeros(e - s)
+    for _ in range(_STEPS):
+        engine.step(X, out=X)
+        # Q_q of ρ = diag(x) is identically 0 (density_ops.q_correction_diagonal)
+        penalty[~np.isfinite(X).all(axis=1)] = np.nan
+        score += state_entropy(X)
+    out[s:e, :n] = X
+    out[s:e, n] = penalty
+    out[s:e, n + 1] = score
+    return e - s
+
+
+def run_ensemble(x0s, eps, A, W1, W2, steps, processes=None, chunk_size=None):
+    """
+    Run the pipeline for every row of `x0s` (runs, n) with the matching
+    entry of `eps` (scalar or (runs,)).
+
+    Returns a (runs, n + 2) array: columns [:n] are the final states,
+    column n the quantum penalty and column n + 1 the consciousness score,
+    matching run_pi0_pipeline / consciousness_score for each run.
+    Each worker advances its chunk of runs as one batch through
+    UpdateEngine, so chunks should be a few hundred runs or more.
+    """
+    x0s = np.asarray(x0s, dtype=np.float64)
+    runs, n = x0s.shape
+    eps = np.broadcast_to(np.asarray(eps, dtype=np.float64), (runs,))
+    processes = processes or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-runs // (4 * processes)))
+    bounds = [(s, min(s + chunk_size, runs)) for s in range(0, runs, chunk_size)]
+
+    arrays = {'x0': x0s, 'eps': eps, 'W1': W1, 'W2': W2,
+              'out': np.zeros((runs, n + 2))}
+    sparse_A = as_sparse(A) if is_sparse(A) else None
+    if sparse_A is None:
+        arrays['A'] = A
+    handles, specs = {}, {}
+    try:
+        for key, arr in arrays.items():
+            shm, spec = _share(arr)
+            handles[key] = shm
+            specs[key] = spec
+        if processes == 1:
+            _init_worker(specs, steps, sparse_A)
+            try:
+                for b in bounds:
+                    _run_chunk(b)
+            finally:
+                _SHARED.clear()
+                while _HANDLES:
+                    _HANDLES.pop().close()
+        else:
+            with mp.Pool(processes, initializer=_init_worker,
+                         initargs=(specs, steps, sparse_A)) as pool:
+                for _ in pool.imap_unordered(_run_chunk, bounds):
+                    pass
+        return np.ndarray((runs, n + 2), buffer=handles['out'].buf).copy()
+    finally:
+        for shm in handles.values():
+            shm.close()
+            shm.unlink()
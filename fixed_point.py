@@ -0,0 +1,82 @@
+"""Convergence-tracked and accelerated fixed-point iteration x ← g(x)."""
+
+import numpy as np
+
+
+def _anderson(g, x, tol, max_iter, m):
+    # Type-II Anderson mixing on the last m residual differences:
+    #   x_{k+1} = g(x_k) − ΔG·γ,  γ = argmin ||f_k − ΔF·γ||₂,  f = g(x) − x
+    gx = g(x)
+    f = gx - x
+    res = float(np.linalg.norm(f))
+    it = 1
+    dG, dF = [], []
+    while res > tol and it < max_iter:
+        if dF:
+            F = np.stack(dF, axis=1)
+            gamma = np.linalg.lstsq(F, f, rcond=None)[0]
+            x_new = gx - np.stack(dG, axis=1) @ gamma
+        else:
+            x_new = gx
+        gx_new = g(x_new)
+        f_new = gx_new - x_new
+        it += 1
+        dG.append(gx_new - gx)
+        dF.append(f_new - f)
+        if len(dF) > m:
+            dG.pop(0)
+            dF.pop(0)
+        x, gx, f = x_new, gx_new, f_new
+        res = float(np.linalg.norm(f))
+    return gx, it, res
+
+
+def _aitken(g, x, tol, max_iter):
+    # Vector Aitken Δ² on (x, g(x), g²(x)), one extrapolation per 2 maps.
+    it = 0
+    res = np.inf
+    while it < max_iter:
+        x1 = g(x)
+        it += 1
+        d1 = x1 - x
+        res = float(np.linalg.norm(d1))
+        if res <= tol or it >= max_iter:
+            return x1, it, res
+        x2 = g(x1)
+        it += 1
+        d2 = x2 - x1
+        res = float(np.linalg.norm(d2))
+        if res <= tol:
+            return x2, it, res
+        dd = d2 - d1
+        denom = float(dd @ dd)
+        x = x2 - (float(d2 @ dd) / denom) * d2 if denom > 0.0 else x2
+    return x, it, res
+
+
+def solve_fixed_point(g, x0, tol=1e-10, max_iter=1000, accel=None, m=5):
+    """
+    Iterate x ← g(x) until the residual ||g(x) − x||₂ ≤ tol.
+
+    accel: None (plain iteration), 'anderson' (depth m) or 'aitken'.
+    Returns {"state", "iterations", "residual", "converged"}, where
+    iterations counts applications of g.
+    """
+    x = np.array(x0, dtype=np.float64)
+    if accel == 'anderson':
+        x, it, res = _anderson(g, x, tol, max_iter, m)
+    elif accel == 'aitken':
+        x, it, res = _aitken(g, x, tol, max_iter)
+    elif accel is None:
+        it, res = 0, np.inf
+        while it < max_iter:
+            x_new = g(x)
+            it += 1
+            res = float(np.linalg.norm(x_new - x))
+            x = x_new
+            if res <= tol:
+                break
+    else:
+        raise ValueError(f"Unknown acceleration: {accel}")
+    return {"state": x, "iterations": it, "residual": res,
+            "converged": res <= tol}
@@ -0,0 +1,238 @@
+"""
+Bounded in-memory history that spills old entries to append-only segments.
+Standard library only, like the kernels that use it.
+"""
+
+import bisect
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+from collections import deque
+
+SEGMENT_ENTRIES = 65536  # entries per segment file
+INDEX_STRIDE = 64        # one index mark per this many spilled entries
+
+
+class SpillingLog:
+    """
+    List-like log keeping the newest `maxlen` entries in RAM. Older ones are
+    pickled in order to segment files seg-NNNNNN.pkl under `path` (a temp
+    directory if None), each with a sparse .idx sidecar holding one JSON
+    line [key, seq, offset] every INDEX_STRIDE entries.
+
+    `key` names the field (or is a callable) giving each entry's position
+    in time, e.g. 'generation' or 'timestamp'; keys must not decrease.
+    query(lo, hi) bisects the index to the first relevant mark and reads
+    forward from that byte offset, so only the requested part of a
+    segment is touched. len(), indexing and iteration cover spilled and
+    in-memory entries alike, so callers written for a list keep working.
+
+    Reopening an existing `path` picks up its segments, so keys must
+    carry on from where the previous writer stopped. The files hold
+    pickles and must only be read back by the process family that wrote
+    them. A temporary directory is removed by close(), or when the log is
+    garbage-collected.
+    """
+
+    def __init__(self, maxlen=1024, path=None, key=None,
+                 segment_entries=SEGMENT_ENTRIES, stride=INDEX_STRIDE):
+        self.maxlen = maxlen
+        self.path = path
+        self._temporary = path is None
+        self.key = key
+        self.segment_entries = segment_entries
+        self.stride = stride
+        self._ring = deque()
+        self._segments = []
+        self._spilled = 0
+        self._writer = None
+        self._index_writer = None
+        self._cleanup = None
+        if path and os.path.isdir(path):
+            self._load_index()
+
+    def _key(self, entry, seq):
+        if self.key is None:
+            return seq
+        if callable(self.key):
+            return self.key(entry)
+        return entry[self.key]
+
+    def _file(self, seg, ext):
+        return os.path.join(self.path, 'seg-%06d.%s' % (seg['n'], ext))
+
+    def _load_index(self):
+        names = sorted(f for f in os.listdir(self.path) if f.endswith('.idx'))
+        for name in names:
+            seg = {'n': int(name[4:10]), 'first': self._spilled, 'count': 0, 'marks': []}
+            with open(os.path.join(self.path, name)) as f:
+                seg['marks'] = [tuple(json.loads(line)) for line in f if line.strip()]
+            if not seg['marks']:
+                continue
+            seg['lo'] = seg['hi'] = seg['marks'][0][0]
+            # Entries after the last mark give the count and the upper key
+            key, seq, offset = seg['marks'][-1]
+            seg['count'] = seq - seg['first']
+            for entry in self._read(seg, offset):
+                seg['hi'] = self._key(entry, seg['first'] + seg['count'])
+                seg['count'] += 1
+            self._segments.append(seg)
+            self._spilled += seg['count']
+
+    def _open_segment(self):
+        self._close_writers()
+        if self.path is None:
+            self.path = tempfile.mkdtemp(prefix='pi0-history-')
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self.path, True)
+        os.makedirs(self.path, exist_ok=True)
+        n = self._segments[-1]['n'] + 1 if self._segments else 0
+        seg = {'n': n, 'first': self._spilled, 'count': 0, 'marks': []}
+        self._segments.append(seg)
+        self._writer = open(self._file(seg, 'pkl'), 'ab')
+        self._index_writer = open(self._file(seg, 'idx'), 'a')
+        return seg
+
+    def _spill(self, entry):
+        seg = self._segments[-1] if self._writer else None
+        if seg is None or seg['count'] >= self.segment_entries:
+            seg = self._open_segment()
+        seq = self._spilled
+        key = self._key(entry, seq)
+        offset = self._writer.tell()
+        pickle.dump(entry, self._writer, protocol=pickle.HIGHEST_PROTOCOL)
+        if seg['count'] % self.stride == 0:
+            seg['marks'].append((key, seq, offset))
+            self._index_writer.write(json.dumps([key, seq, offset]) + '\n')
+        if seg['count'] == 0:
+            seg['lo'] = key
+        seg['hi'] = key
+        seg['count'] += 1
+        self._spilled += 1
+
+    def _read(self, seg, offset=0):
+        # Stream entries of one segment from a byte offset onwards
+        if self._writer is not None and seg is self._segments[-1]:
+            self._writer.flush()
+        with open(self._file(seg, 'pkl'), 'rb') as f:
+            f.seek(offset)
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def append(self, entry):
+        self._ring.append(entry)
+        while len(self._ring) > self.maxlen:
+            self._spill(self._ring.popleft())
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self):
+        return self._spilled + len(self._ring)
+
+    def __iter__(self):
+        ring = list(self._ring)
+        for seg in list(self._segments):
+            yield from self._read(seg)
+        yield from ring
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('SpillingLog index out of range')
+        if i >= self._spilled:
+            return self._ring[i - self._spilled]
+        firsts = [seg['first'] for seg in self._segments]
+        seg = self._segments[bisect.bisect_right(firsts, i) - 1]
+        key, seq, offset = seg['marks'][(i - seg['first']) // self.stride]
+        for j, entry in enumerate(self._read(seg, offset), seq):
+            if j == i:
+                return entry
+
+    def recent(self, n=None):
+        """The newest n entries (default: all still in memory)."""
+        ring = list(self._ring)
+        if n is None:
+            return ring
+        if n > len(ring):
+            return self[max(len(self) - n, 0):]
+        return ring[len(ring) - n:]
+
+    def since(self, seq):
+        """
+        Entries from sequence number `seq` on, i.e. self[seq:], read from
+        the nearest index mark, so a delta costs O(new entries).
+        """
+        seq = max(seq, 0)
+        ring = list(self._ring)
+        if seq >= self._spilled:
+            return ring[seq - self._spilled:]
+        out = []
+        for seg in list(self._segments):
+            if seg['first'] + seg['count'] <= seq:
+                continue
+            key, start, offset = seg['marks'][max(seq - seg['first'], 0) // self.stride]
+            for j, entry in enumerate(self._read(seg, offset), start):
+                if j >= seq:
+                    out.append(entry)
+        return out + ring
+
+    def query(self, lo=None, hi=None):
+        """Entries whose key lies in [lo, hi]; either bound may be None."""
+        out = []
+        for seg in list(self._segments):
+            if (lo is not None and seg['hi'] < lo) or (hi is not None and seg['lo'] > hi):
+                continue
+            marks = seg['marks']
+            start = 0
+            if lo is not None:
+                start = max(bisect.bisect_left([m[0] for m in marks], lo) - 1, 0)
+            key, seq, offset = marks[start]
+            for j, entry in enumerate(self._read(seg, offset), seq):
+                k = self._key(entry, j)
+                if hi is not None and k > hi:
+                    break
+                if lo is None or k >= lo:
+                    out.append(entry)
+        for j, entry in enumerate(list(self._ring), self._spilled):
+            k = self._key(entry, j)
+            if (lo is None or k >= lo) and (hi is None or k <= hi):
+                out.append(entry)
+        return out
+
+    def flush(self):
+        if self._writer is not None:
+            self._writer.flush()
+            self._index_writer.flush()
+
+    def _close_writers(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._index_writer.close()
+            self._writer = self._index_writer = None
+
+    def close(self):
+        """
+        Close the segment files. With a caller-given path the in-memory
+        entries are spilled first, so reopening the path restores all; a
+        temporary directory is deleted and only the in-memory entries stay.
+        """
+        if not self._temporary:
+            while self._ring:
+                self._spill(self._ring.popleft())
+        self._close_writers()
+        if self._cleanup is not None:
+            self._cleanup()
+            self._cleanup = None
+            self.path = None
+            self._segments = []
+            self._spilled = 0
@@ -0,0 +1,52 @@
+"""Jump-ahead for the Pi0Kernel DNA generator x ← (a·x + c) mod m."""
+
+DNA_MULT = 1618
+DNA_INC = 1
+DNA_MOD = 10**15
+
+
+def affine_jump(k, a=DNA_MULT, c=DNA_INC, m=DNA_MOD):
+    """
+    (A, C) with f^k(x) = (A·x + C) mod m for f(x) = (a·x + c) mod m.
+
+    Composing f with itself gives (a², a·c + c), so f^k follows by binary
+    exponentiation in O(log k) exact integer steps. The geometric-series
+    form c·(a^k − 1)/(a − 1) is avoided because a − 1 need not be
+    invertible mod m (for the DNA generator it is not).
+    """
+    if k < 0:
+        raise ValueError('cannot step the generator backwards')
+    A, C = 1, 0
+    ba, bc = a % m, c % m
+    while k:
+        if k & 1:
+            A, C = (ba * A) % m, (ba * C + bc) % m
+        ba, bc = (ba * ba) % m, (ba * bc + bc) % m
+        k >>= 1
+    return A, C
+
+
+def lcg_advance(x, k, a=DNA_MULT, c=DNA_INC, m=DNA_MOD):
+    """x after k generator steps; equal to stepping k times."""
+    A, C = affine_jump(k, a, c, m)
+    return (A * x + C) % m
+
+
+def advance_dna(dna, k, a=DNA_MULT, c=DNA_INC, m=DNA_MOD):
+    """New dict with every dna value stepped k generations at once."""
+    if not k:
+        # Zero steps leave the values as they are, unreduced seeds included
+        return dict(dna)
+    A, C = affine_jump(k, a, c, m)
+    return {key: (A * v + C) % m for key, v in dna.items()}
+
+
+def dna_at(seed, dna, generation, target):
+    """
+    dna at generation `target`, given the `seed` dict (generation 0) and
+    the current `dna` at `generation`: forward from the current state,
+    else replayed from the seed.
+    """
+    if target >= generation:
+        return advance_dna(dna, target - generation)
+    return advance_dna(seed, target)
@@ -0,0 +1,133 @@
+"""Modular matrix powers M^p mod m with cached squarings."""
+
+import numbers
+import operator
+from collections import OrderedDict
+
+import numpy as np
+
+INT64_MAX = 2**63 - 1
+CACHE_SIZE = 16  # base matrices whose squarings are kept
+
+
+def _limb_bits(n, mod):
+    """
+    Bits per limb s such that an int64 product A·B_i, with A < mod and
+    limb B_i < 2^s, cannot overflow, and Horner's acc·2^s stays in range.
+    Returns 0 when no int64 split exists and object ints are required.
+    """
+    if mod <= 1 or mod > INT64_MAX:
+        return 0
+    bits = (mod - 1).bit_length()
+    if n * (mod - 1) ** 2 <= INT64_MAX:
+        return bits
+    s = bits - 1
+    while s > 0 and (n * (mod - 1) * ((1 << s) - 1) > INT64_MAX
+                     or (mod - 1) * ((1 << s) + 1) > INT64_MAX):
+        s -= 1
+    return s
+
+
+def matmul_mod(A, B, mod, limb_bits=None):
+    """
+    (A·B) mod m. A and B must already be reduced into [0, m).
+
+    int64 path: when n·(m−1)² fits in int64 this is one matmul. Otherwise
+    B is split into s-bit limbs B = Σ B_i·2^(s·i), each A·B_i is exact in
+    int64, and the parts are recombined by Horner's rule mod m. object
+    arrays (limb_bits 0) fall back to exact Python-int arithmetic.
+    """
+    if limb_bits is None:
+        limb_bits = _limb_bits(A.shape[-1], mod) if A.dtype != object else 0
+    if A.dtype == object or limb_bits == 0:
+        return np.dot(A, B) % mod
+    bits = (mod - 1).bit_length()
+    if limb_bits >= bits:
+        return (A @ B) % mod
+    mask = (1 << limb_bits) - 1
+    shift = limb_bits * ((bits - 1) // limb_bits)
+    acc = None
+    while shift >= 0:
+        part = (A @ ((B >> shift) & mask)) % mod
+        if acc is None:
+            acc = part
+        else:
+            acc <<= limb_bits
+            acc += part
+            acc %= mod
+        shift -= limb_bits
+    return acc
+
+
+class ModularMatrixPower:
+    """
+    M^p mod m by binary exponentiation over the squarings M^(2^i), which
+    are computed once and kept, so later powers of the same base only pay
+    for the multiplications (popcount(p) − 1 of them).
+    """
+
+    def __init__(self, matrix, mod):
+        self.mod = mod
+        n = len(matrix)
+        self.n = n
+        self.limb_bits = _limb_bits(n, mod)
+        dtype = np.int64 if self.limb_bits else object
+        base = np.array([[int(v) % mod for v in row] for row in matrix],
+                        dtype=object).reshape(n, n)
+        self._squares = [base.astype(dtype)]
+
+    def _square(self, i):
+        sq = self._squares
+        while len(sq) <= i:
+            sq.append(matmul_mod(sq[-1], sq[-1], self.mod, self.limb_bits))
+        return sq[i]
+
+    def power(self, p):
+        """M^p mod m as an ndarray; p = 0 gives the identity."""
+        p = operator.index(p)
+        if p < 0:
+            raise ValueError('power must be non-negative')
+        result = None
+        i = 0
+        while p:
+            if p & 1:
+                sq = self._square(i)
+                result = sq.copy() if result is None else \
+                    matmul_mod(result, sq, self.mod, self.limb_bits)
+            p >>= 1
+            i += 1
+        if result is None:
+            result = np.identity(self.n, dtype=self._squares[0].dtype)
+        return result
+
+    def powers(self, ps):
+        return [self.power(p) for p in ps]
+
+
+_CACHE = OrderedDict()
+
+
+def _key(matrix, mod):
+    return (mod, tuple(tuple(int(v) for v in row) for row in matrix))
+
+
+def matrix_power_mod(matrix, powers, mod):
+    """
+    matrix^p mod m for one power or a sequence of powers, as nested lists
+    of Python ints. Engines are kept for the CACHE_SIZE most recent base
+    matrices, so repeated calls reuse their squarings.
+    """
+    key = _key(matrix, mod)
+    engine = _CACHE.pop(key, None)
+    if engine is None:
+        engine = ModularMatrixPower(matrix, mod)
+    _CACHE[key] = engine
+    while len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    if isinstance(powers, numbers.Integral):
+        return [[int(v) for v in row] for row in engine.power(powers)]
+    return [[[int(v) for v in row] for row in r] for r in engine.powers(powers)]
+
+
+def clear_cache():
+    _CACHE.clear()
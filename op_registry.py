@@ -0,0 +1,325 @@
+"""
+Operator registry: one name per primitive, several backends per name.
+
+Each primitive (drift, expand, collapse, normalize, matmul, commutator,
+...) can hold a pure-Python, a NumPy and a native implementation with
+the same call contract. call() picks the fastest backend for the input
+size, from timings measured once per (operator, size bucket) and cached
+on disk. The public primitives of core_ops, pi0_system and quantum_ops
+all dispatch through call(); their pure loops are the `*_py` functions.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+import core_ops
+import quantum_ops
+from batch_ops import UpdateEngine
+from density_ops import q_correction
+from sparse_ops import as_sparse, is_sparse
+
+# name -> {backend: callable}
+_REGISTRY = {}
+# name -> {bucket: {backend: seconds per call}}
+_TIMINGS = None
+# name -> callable(n) building sample args for calibration
+_SAMPLES = {}
+# (name, bucket) -> chosen backend, so call() does no bookkeeping per call
+_CHOICE = {}
+
+# A backend that is this many times slower than the best one in some
+# bucket is not timed again in any larger bucket.
+SKIP_FACTOR = 10.0
+# Calibration walks the buckets up from here...
+MIN_BUCKET = 8
+# ...and never runs a call predicted to take longer than this (seconds);
+# such backends get an extrapolated timing instead.
+MAX_CALL_SECONDS = 0.25
+# Assumed per-doubling growth of a backend timed in only one bucket
+DEFAULT_GROWTH = 8.0
+
+
+def register(name, backend, func, sample=None):
+    """Register `func` as the `backend` implementation of operator `name`."""
+    _REGISTRY.setdefault(name, {})[backend] = func
+    if sample is not None:
+        _SAMPLES[name] = sample
+    _CHOICE.clear()
+    return func
+
+
+def names():
+    return sorted(_REGISTRY)
+
+
+def backends(name):
+    return sorted(_REGISTRY.get(name, {}))
+
+
+def get(name, backend):
+    return _REGISTRY[name][backend]
+
+
+# — Timing cache —
+
+def timings_path():
+    default = os.path.join(os.path.expanduser('~'), '.cache', 'pi0',
+                           'op_timings.json')
+    return os.environ.get('PI0_TIMINGS_PATH', default)
+
+
+def _load_timings():
+    global _TIMINGS
+    if _TIMINGS is None:
+        try:
+            with open(timings_path()) as f:
+                _TIMINGS = json.load(f)
+        except (OSError, ValueError):
+            _TIMINGS = {}
+    return _TIMINGS
+
+
+def _save_timings():
+    path = timings_path()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(_TIMINGS, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def reset_timings():
+    """Forget all measured timings, in memory and on disk."""
+    global _TIMINGS
+    _TIMINGS = {}
+    _CHOICE.clear()
+    try:
+        os.remove(timings_path())
+    except OSError:
+        pass
+
+
+def _bucket(n):
+    """Round n up to a power of two; timings are shared within a bucket."""
+    b = 1
+    while b < n:
+        b *= 2
+    return b
+
+
+def _time_call(func, args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+        if best > MAX_CALL_SECONDS:
+            break
+    return best
+
+
+def _skipped(name, bucket):
+    # Backends already SKIP_FACTOR× slower than the best at a smaller size.
+    skip = set()
+    for b, row in _load_timings().get(name, {}).items():
+        if int(b) < bucket and row:
+            best = min(row.values())
+            skip.update(k for k, v in row.items() if v > SKIP_FACTOR * best)
+    return skip
+
+
+def _calibrate_bucket(name, bucket, prev, growth):
+    skip = _skipped(name, bucket)
+    args = None
+    row = {}
+    for backend, func in _REGISTRY[name].items():
+        if backend in skip:
+            continue
+        if backend in prev:
+            predicted = prev[backend] * growth.get(backend, DEFAULT_GROWTH)
+            if predicted > MAX_CALL_SECONDS:
+                row[backend] = predicted
+                continue
+        if args is None:
+            args = _SAMPLES[name](bucket)
+        row[backend] = _time_call(func, args)
+    return row
+
+
+def calibrate(name, n):
+    """
+    Time the backends of `name` bucket by bucket, from MIN_BUCKET up to
+    bucket(n), and persist the results. Each step reuses the timings of
+    the one below: backends SKIP_FACTOR× slower than the best are dropped,
+    and a backend whose next call is predicted (from its measured growth
+    per doubling) to exceed MAX_CALL_SECONDS is extrapolated instead of
+    run, so a slow pure-Python backend is never timed at a large n.
+    """
+    target = _bucket(n)
+    table = _load_timings().setdefault(name, {})
+    impls = set(_REGISTRY[name])
+    prev, growth = {}, {}
+    bucket = min(MIN_BUCKET, target)
+    while True:
+        row = table.get(str(bucket))
+        if row is None or impls - set(row) - _skipped(name, bucket):
+            row = _calibrate_bucket(name, bucket, prev, growth)
+            table[str(bucket)] = row
+        for backend, t in row.items():
+            if prev.get(backend, 0) > 0:
+                growth[backend] = max(t / prev[backend], 2.0)
+        prev = row
+        if bucket >= target:
+            break
+        bucket *= 2
+    _CHOICE.clear()
+    _save_timings()
+    return row
+
+
+def select(name, n):
+    """Name of the fastest backend of `name` for inputs of size n."""
+    bucket = _bucket(n)
+    choice = _CHOICE.get((name, bucket))
+    if choice is not None:
+        return choice
+    impls = _REGISTRY[name]
+    if len(impls) == 1:
+        choice = next(iter(impls))
+    else:
+        row = _load_timings().get(name, {}).get(str(bucket))
+        # (Re)calibrate when a backend was registered after the last timing.
+        if row is None or set(impls) - set(row) - _skipped(name, bucket):
+            if name not in _SAMPLES:
+                return 'numpy' if 'numpy' in impls else next(iter(impls))
+            row = calibrate(name, n)
+        timed = {k: v for k, v in row.items() if k in impls}
+        choice = min(timed, key=timed.get)
+    _CHOICE[(name, bucket)] = choice
+    return choice
+
+
+def _size(args):
+    try:
+        return len(args[0])
+    except TypeError:
+        return 1
+
+
+def call(name, *args, **kwargs):
+    """Run operator `name` on the fastest backend for the input size."""
+    return _REGISTRY[name][select(name, _size(args))](*args, **kwargs)
+
+
+# — Sample inputs for calibration —
+
+def sample_args(name, n):
+    """Calibration inputs of size n for operator `name`; None without a sample."""
+    sample = _SAMPLES.get(name)
+    return sample(n) if sample is not None else None
+
+
+def _vec(n):
+    return np.random.default_rng(0).random(n).tolist()
+
+
+def _mat(n):
+    return np.random.default_rng(1).uniform(-1, 1, (n, n)).tolist()
+
+
+def _diag(n):
+    return quantum_ops.lift_density_py(_vec(n))
+
+
+# — NumPy backends (same list-in/list-out contract as the pure ones) —
+
+def _np_drift(x, A):
+    if is_sparse(A):
+        return as_sparse(A).rmatmat(np.asarray(x, dtype=np.float64)).tolist()
+    return (np.asarray(x, dtype=np.float64) @ np.asarray(A, dtype=np.float64)).tolist()
+
+
+def _np_expand(x, W1, W2):
+    h = np.asarray(W1, dtype=np.float64) @ np.asarray(x, dtype=np.float64)
+    np.maximum(h, 0.0, out=h)
+    return (np.asarray(W2, dtype=np.float64) @ h).tolist()
+
+
+def _np_collapse(x, eps):
+    x = np.asarray(x, dtype=np.float64)
+    return (-eps * (x * x)).tolist()
+
+
+def _np_normalize(x, eps_norm=1e-12):
+    x = np.asarray(x, dtype=np.float64)
+    return (x / np.sqrt(eps_norm + x @ x)).tolist()
+
+
+def _np_update_vector(x, A, W1, W2, eps):
+    return UpdateEngine(A, W1, W2, eps).step(x).tolist()
+
+
+def _np_lift_density(x):
+    return np.diag(np.asarray(x, dtype=np.float64)).tolist()
+
+
+def _np_matmul(A, B):
+    return (np.asarray(A, dtype=np.float64) @ np.asarray(B, dtype=np.float64)).tolist()
+
+
+def _np_transpose(A):
+    return np.asarray(A).T.tolist()
+
+
+def _np_trace(M):
+    return float(np.trace(np.asarray(M, dtype=np.float64)))
+
+
+def _np_commutator(A, B):
+    A = np.asarray(A, dtype=np.float64)
+    B = np.asarray(B, dtype=np.float64)
+    return (A @ B - B @ A).tolist()
+
+
+def _np_q_correction(rho, A, W1, W2, eps):
+    return q_correction(rho, A, W1, W2, eps)
+
+
+_BUILTINS = [
+    ('drift', core_ops.drift_py, _np_drift, lambda n: (_vec(n), _mat(n))),
+    ('expand', core_ops.expand_py, _np_expand, lambda n: (_vec(n), _mat(n), _mat(n))),
+    ('collapse', core_ops.collapse_py, _np_collapse, lambda n: (_vec(n), 0.01)),
+    ('normalize', core_ops.normalize_py, _np_normalize, lambda n: (_vec(n),)),
+    ('update_vector', core_ops.update_vector_py, _np_update_vector,
+     lambda n: (_vec(n), _mat(n), _mat(n), _mat(n), 0.01)),
+    ('lift_density', quantum_ops.lift_density_py, _np_lift_density, lambda n: (_vec(n),)),
+    ('matmul', quantum_ops.matmul_py, _np_matmul, lambda n: (_mat(n), _mat(n))),
+    ('transpose', quantum_ops.transpose_py, _np_transpose, lambda n: (_mat(n),)),
+    ('trace', quantum_ops.trace_py, _np_trace, lambda n: (_mat(n),)),
+    ('commutator', quantum_ops.commutator_py, _np_commutator, lambda n: (_mat(n), _mat(n))),
+    ('Q_correction', quantum_ops.Q_correction_py, _np_q_correction,
+     lambda n: (_diag(n), _mat(n), _mat(n), _mat(n), 0.01)),
+]
+
+for _name, _py, _np_impl, _sample in _BUILTINS:
+    register(_name, 'python', _py, sample=_sample)
+    register(_name, 'numpy', _np_impl)
+
+
+def register_native(lib_path=None):
+    """
+    Register the ctypes operators of the pi0core C library (see pi0quantum)
+    under the 'native' backend. Returns the names that were registered.
+    """
+    from pi0quantum import initialize_pi0system
+    ops = initialize_pi0system(lib_path)
+    for name, func in ops.items():
+        register(name, 'native', func)
+    return sorted(ops)
+
+
+__all__ = ['register', 'register_native', 'names', 'backends', 'get', 'select',
+           'call', 'calibrate', 'reset_timings', 'timings_path', 'sample_args']
@@ -1,25 +1,75 @@
 
 import numpy as np
 
+def _full_spectrum(half, n, axis):
+    # Rebuild the n-point spectrum of a real signal from its rfft half
+    # using Hermitian symmetry: X[n-k] = conj(X[k]).
+    half = np.moveaxis(half, axis, -1)
+    full = np.empty(half.shape[:-1] + (n,), dtype=half.dtype)
+    m = half.shape[-1]
+    full[..., :m] = half
+    np.conjugate(half[..., 1:n - m + 1][..., ::-1], out=full[..., m:])
+    return np.moveaxis(full, -1, axis)
+
 class MathematicalOperators:
-    def __init__(self):
-        pass
+    def __init__(self, memory_budget=256 * 2**20):
+        # Bytes of result that matrix_multiply computes per row chunk
+        self.memory_budget = memory_budget
 
-    def pi0_transform(self, data, scale=1.0, shift=0.0):
-        data = np.array(data)
-        return np.fft.fft(data) * scale + shift
+    def pi0_transform(self, data, scale=1.0, shift=0.0, axis=-1, onesided=False):
+        # Real input goes through rfft; onesided=True returns only the
+        # non-negative frequencies (n//2 + 1 bins) instead of mirroring.
+        data = np.asarray(data)
+        if np.isrealobj(data):
+            spectrum = np.fft.rfft(data, axis=axis)
+            if not onesided:
+                spectrum = _full_spectrum(spectrum, data.shape[axis], axis)
+        else:
+            spectrum = np.fft.fft(data, axis=axis)
+        return spectrum * scale + shift
 
-    def matrix_multiply(self, A, B, normalize=False):
-        result = np.matmul(A, B)
+    def matrix_multiply(self, A, B, normalize=False, out=None, memory_budget=None):
+        # Stacked (..., m, k) @ (..., k, n) with broadcasting. The product is
+        # written into `out` (which may be an np.memmap) in row chunks of at
+        # most `memory_budget` bytes, and normalize divides it in place by
+        # its overall Frobenius norm, chunk by chunk.
+        A, B = np.asarray(A), np.asarray(B)
+        if A.ndim < 2 or B.ndim < 2:
+            result = np.matmul(A, B, out=out)
+            if normalize:
+                if out is None:
+                    return result / np.linalg.norm(result)
+                result /= np.linalg.norm(result)
+            return result
+        shape = np.broadcast_shapes(A.shape[:-2], B.shape[:-2]) + (A.shape[-2], B.shape[-1])
+        if out is None:
+            dtype = np.result_type(A, B, 1.0) if normalize else np.result_type(A, B)
+            out = np.empty(shape, dtype=dtype)
+        budget = self.memory_budget if memory_budget is None else memory_budget
+        rows = shape[-2]
+        row_bytes = max(out[..., :1, :].nbytes, 1)
+        step = max(1, min(rows, budget // row_bytes))
+        chunks = [(..., slice(r, r + step), slice(None)) for r in range(0, rows, step)]
+        for c in chunks:
+            np.matmul(A[c], B, out=out[c])
         if normalize:
-            result = result / np.linalg.norm(result)
-        return result
+            sq = 0.0
+            for c in chunks:
+                block = out[c]
+                sq += float(np.vdot(block, block).real) if block.flags.c_contiguous \
+                    else float(np.sum(np.abs(block) ** 2))
+            norm = np.sqrt(sq)
+            for c in chunks:
+                out[c] /= norm
+        return out
 
-    def quantum_fourier(self, data):
-        data = np.array(data)
-        n = len(data)
-        result = np.zeros(n, dtype=complex)
-        for k in range(n):
-            for j in range(n):
-                result[k] += data[j] * np.exp(2j * np.pi * k * j / n)
-        return result / np.sqrt(n)
+    def quantum_fourier(self, data, axis=-1):
+        # QFT_k = Σ_j x_j·exp(+2πi·jk/n)/√n, i.e. the orthonormal inverse DFT,
+        # applied along `axis` so a stack of vectors is transformed at once.
+        data = np.asarray(data)
+        if np.isrealobj(data):
+            # For real x: ifft(x)·√n = conj(rfft(x))/√n, mirrored to n bins.
+            n = data.shape[axis]
+            half = np.conjugate(np.fft.rfft(data, axis=axis)) / np.sqrt(n)
+            return _full_spectrum(half, n, axis)
+        return np.fft.ifft(data, axis=axis, norm='ortho')
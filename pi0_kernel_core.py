@@ -4,6 +4,8 @@ Pi0 Core Operator - Self-Generating Agnostic Kernel
 Zero dependencies, self-persistent, universal system core
 """
 
+from uss_codec import encode, encode_many, text_sum
+
 class Pi0PersistentKernel:
     def __init__(self):
         self.dna = {
@@ -40,19 +42,31 @@ class Pi0PersistentKernel:
         elif operation_type == 'uss_communicate':
             target_system = args[0] if args else 'unknown'
             message = args[1] if len(args) > 1 else 'ping'
-            protocol_hash = sum(ord(c) for c in target_system) % 1000
-            
-            encoded = ""
-            for char in str(message):
-                encoded += chr((ord(char) + protocol_hash) % 256)
+            protocol_hash = text_sum(target_system) % 1000
             
             return {
                 'target': target_system,
-                'encoded_message': encoded,
+                'encoded_message': encode(str(message), protocol_hash),
                 'protocol_hash': protocol_hash,
                 'timestamp': self.persistent_state['generation']
             }
         
+        elif operation_type == 'uss_communicate_many':
+            target_system = args[0] if args else 'unknown'
+            messages = args[1] if len(args) > 1 else ['ping']
+            protocol_hash = text_sum(target_system) % 1000
+            timestamp = self.persistent_state['generation']
+            
+            return [
+                {
+                    'target': target_system,
+                    'encoded_message': encoded,
+                    'protocol_hash': protocol_hash,
+                    'timestamp': timestamp
+                }
+                for encoded in encode_many([str(m) for m in messages], protocol_hash)
+            ]
+        
         else:
             return self._auto_generate_operation(operation_type, *args)
     
@@ -2,9 +2,13 @@
   
 import math  
   
+from sparse_ops import as_sparse, is_sparse  
+  
 # — Core Vector Primitives —   
-def drift(x, A):  
-    """L[x] = Aᵀ·x  (graph drift)"""  
+def drift_py(x, A):  
+    """L[x] = Aᵀ·x  (graph drift); O(nnz) for a sparse A (SparseAdjacency or scipy.sparse)"""  
+    if is_sparse(A):  
+        return as_sparse(A).rmatvec(x)  
     n = len(x)  
     out = [0.0]*n  
     for i in range(n):  
@@ -14,7 +18,7 @@ def drift(x, A):
         out[i] = s  
     return out  
   
-def expand(x, W1, W2):  
+def expand_py(x, W1, W2):  
     """N[x] = W2·ReLU(W1·x)  (nonlinear expansion)"""  
     n = len(x)  
     tmp = [0.0]*n  
@@ -31,11 +35,11 @@ def expand(x, W1, W2):
         out[i] = s  
     return out  
   
-def collapse(x, eps):  
+def collapse_py(x, eps):  
     """C[x] = –ε·(x⊙x)  (superposition penalty)"""  
     return [-eps*(xi*xi) for xi in x]  
   
-def normalize(x, eps_norm=1e-12):  
+def normalize_py(x, eps_norm=1e-12):  
     """M[x] = x/||x||₂  (stability)"""  
     sum_sq = eps_norm  
     for xi in x:  
@@ -43,24 +47,21 @@ def normalize(x, eps_norm=1e-12):
     norm = math.sqrt(sum_sq)  
     return [xi/norm for xi in x]  
   
-def update_vector(x, A, W1, W2, eps):  
-    """  
-    One step: x_{t+1} = M(x_t + N(L(x_t)) + C(x_t))  
-    """  
-    d = drift(x, A)  
-    e = expand(d, W1, W2)  
-    c = collapse(x, eps)  
+def update_vector_py(x, A, W1, W2, eps):  
+    """One update step: x → M(x + N(L(x)) + C(x))"""  
+    d = drift_py(x, A)  
+    e = expand_py(d, W1, W2)  
+    c = collapse_py(x, eps)  
     y = [d_i + e_i + c_i for d_i,e_i,c_i in zip(d,e,c)]  
-    return normalize(y)  
+    return normalize_py(y)  
   
-&nbsp;  
- # — Quantum-Calculus Primitives —   
-def lift_density(x):  
+# — Quantum-Calculus Primitives —   
+def lift_density_py(x):  
     """ρ = diag(x)"""  
     n = len(x)  
     return [[x[i] if i==j else 0.0 for j in range(n)] for i in range(n)]  
   
-def matmul(A, B):  
+def matmul_py(A, B):  
     """Matrix multiply A·B"""  
     n = len(A)  
     C = [[0.0]*n for _ in range(n)]  
@@ -72,29 +73,30 @@ def matmul(A, B):
             C[i][j] = s  
     return C  
   
-def transpose(A):  
+def transpose_py(A):  
     """Transpose of A"""  
     n = len(A)  
     return [[A[j][i] for j in range(n)] for i in range(n)]  
   
-def trace(M):  
+def trace_py(M):  
     """Trace of M"""  
     return sum(M[i][i] for i in range(len(M)))  
   
-def commutator(A, B):  
+def commutator_py(A, B):  
     """[A,B] = A·B − B·A"""  
     return [[AB - BA for AB,BA in zip(ARow, BRow)]   
-            for ARow,BRow in zip(matmul(A,B), matmul(B,A))]  
+            for ARow,BRow in zip(matmul_py(A,B), matmul_py(B,A))]  
   
-def Q_correction(rho, A, W1, W2, eps):  
+def Q_correction_py(rho, A, W1, W2, eps):  
     """  
+    Pure-Python reference for Q_correction:  
     Q_q = Tr([N_rho, C_rho]·rho)  
     where N_rho and C_rho lift classical expansion and collapse.  
     """  
     # L_rho = Aᵀ·ρ·A  
-    At = transpose(A)  
-    Ar = matmul(At, rho)  
-    Lrho = matmul(Ar, A)  
+    At = transpose_py(A)  
+    Ar = matmul_py(At, rho)  
+    Lrho = matmul_py(Ar, A)  
     # N_rho  
     n = len(A)  
     tmp = [[0.0]*n for _ in range(n)]  
@@ -104,16 +106,65 @@ def Q_correction(rho, A, W1, W2, eps):
             for k in range(n):  
                 s += W1[i][k]*Lrho[k][j]  
             tmp[i][j] = s if s>0 else 0.0  
-    Nrho = matmul(matmul(W2, tmp), transpose(W2))  
+    Nrho = matmul_py(matmul_py(W2, tmp), transpose_py(W2))  
     # C_rho  
-    Crho = matmul(rho, rho)  
+    Crho = matmul_py(rho, rho)  
     for i in range(n):  
         for j in range(n):  
             Crho[i][j] *= -eps  
     # commutator and trace  
-    comm = commutator(Nrho, Crho)  
+    comm = commutator_py(Nrho, Crho)  
     QC = 0.0  
     for i in range(n):  
         for j in range(n):  
             QC += comm[i][j]*rho[j][i]  
-    return QC  
\ No newline at end of file
+    return QC  
+  
+# — Public primitives: fastest registered backend (see op_registry) —   
+def _call(name, *args, **kwargs):  
+    from op_registry import call  
+    return call(name, *args, **kwargs)  
+  
+def drift(x, A):  
+    """L[x] = Aᵀ·x"""  
+    return _call('drift', x, A)  
+  
+def expand(x, W1, W2):  
+    """N[x] = W2·ReLU(W1·x)"""  
+    return _call('expand', x, W1, W2)  
+  
+def collapse(x, eps):  
+    """C[x] = -ε·(x⊙x)"""  
+    return _call('collapse', x, eps)  
+  
+def normalize(x, eps_norm=1e-12):  
+    """M[x] = x/||x||₂"""  
+    return _call('normalize', x, eps_norm)  
+  
+def update_vector(x, A, W1, W2, eps):  
+    """One step: x → M(x + N(L(x)) + C(x))"""  
+    return _call('update_vector', x, A, W1, W2, eps)  
+  
+def lift_density(x):  
+    """ρ = diag(x)"""  
+    return _call('lift_density', x)  
+  
+def matmul(A, B):  
+    """A·B"""  
+    return _call('matmul', A, B)  
+  
+def transpose(A):  
+    """Aᵀ"""  
+    return _call('transpose', A)  
+  
+def trace(M):  
+    """Tr(M)"""  
+    return _call('trace', M)  
+  
+def commutator(A, B):  
+    """[A,B] = A·B − B·A"""  
+    return _call('commutator', A, B)  
+  
+def Q_correction(rho, A, W1, W2, eps):  
+    """Q_q = Tr([N_rho, C_rho]·rho); 0 for finite rho (density_ops)"""  
+    return _call('Q_correction', rho, A, W1, W2, eps)  
\ No newline at end of file
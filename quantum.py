@@ -1,4 +1,79 @@
 
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
 def q_cov_theta(wigner_tensor, metric='FRW'):
     return float(np.var(wigner_tensor))
+
+class VarianceAccumulator:
+    # Running (count, mean, M2) with Welford-style updates and Chan's
+    # pairwise merge, so partial results from chunks, threads or separate
+    # files combine exactly: var = M2 / count (population, like np.var).
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = int(count)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+
+    @classmethod
+    def from_chunk(cls, chunk):
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if chunk.size == 0:
+            return cls()
+        mean = float(chunk.mean())
+        dev = chunk - mean
+        return cls(chunk.size, mean, float(np.vdot(dev.ravel(), dev.ravel())))
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        return self
+
+    def update(self, chunk):
+        return self.merge(VarianceAccumulator.from_chunk(chunk))
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else float('nan')
+
+    def state(self):
+        return (self.count, self.mean, self.m2)
+
+def _iter_chunks(source, chunk_size):
+    # Arrays and memmaps are walked in flat slices of chunk_size elements,
+    # so only one chunk per worker is paged in at a time.
+    if isinstance(source, np.ndarray):
+        flat = source.reshape(-1)
+        for start in range(0, flat.size, chunk_size):
+            yield flat[start:start + chunk_size]
+    else:
+        yield from source
+
+def q_cov_theta_stream(source, metric='FRW', chunk_size=1 << 22, threads=None,
+                       accumulator=None):
+    # Streaming q_cov_theta over an array, a memmap or an iterable of chunks.
+    # With threads, chunk statistics are computed in parallel (NumPy
+    # releases the GIL) and merged in order. Pass an existing accumulator to
+    # continue across files; it is returned alongside the variance.
+    acc = accumulator if accumulator is not None else VarianceAccumulator()
+    chunks = _iter_chunks(source, chunk_size)
+    if threads:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            window = []
+            for chunk in chunks:
+                window.append(pool.submit(VarianceAccumulator.from_chunk, chunk))
+                if len(window) >= 2 * threads:
+                    acc.merge(window.pop(0).result())
+            for fut in window:
+                acc.merge(fut.result())
+    else:
+        for chunk in chunks:
+            acc.update(chunk)
+    return float(acc.variance), acc
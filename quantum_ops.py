@@ -1,11 +1,11 @@
 # quantum_ops.py  
   
-def lift_density(x):  
+def lift_density_py(x):  
     """ρ = diag(x)"""  
     n = len(x)  
     return [[x[i] if i==j else 0.0 for j in range(n)] for i in range(n)]  
   
-def matmul(A, B):  
+def matmul_py(A, B):  
     """Matrix multiply A·B"""  
     n = len(A)  
     C = [[0.0]*n for _ in range(n)]  
@@ -17,27 +17,32 @@ def matmul(A, B):
             C[i][j] = s  
     return C  
   
-def trace(M):  
+def transpose_py(A):  
+    """Transpose of A"""  
+    n = len(A)  
+    return [[A[j][i] for j in range(n)] for i in range(n)]  
+  
+def trace_py(M):  
     """Trace of M"""  
     return sum(M[i][i] for i in range(len(M)))  
   
-def commutator(A, B):  
+def commutator_py(A, B):  
     """[A,B] = A·B − B·A"""  
-    AB = matmul(A, B)  
-    BA = matmul(B, A)  
+    AB = matmul_py(A, B)  
+    BA = matmul_py(B, A)  
     n=len(A)  
     return [[AB[i][j] - BA[i][j] for j in range(n)] for i in range(n)]  
   
-def Q_correction(rho, A, W1, W2, eps):  
+def Q_correction_py(rho, A, W1, W2, eps):  
     """  
-    Compute Q_q = Tr([N_rho, C_rho] · rho)  
+    Pure-Python reference: compute Q_q = Tr([N_rho, C_rho] · rho)  
     where  
       N_rho[rho] = W2·ReLU(W1·(Aᵀ·rho·A))·W2ᵀ  
       C_rho[rho] = -eps * rho·rho  
     """  
     # Build Aᵀ·rho·A  
-    Arho = matmul([[A[j][i] for j in range(len(A))] for i in range(len(A))], rho)  
-    Lrho = matmul(Arho, A)  
+    Arho = matmul_py([[A[j][i] for j in range(len(A))] for i in range(len(A))], rho)  
+    Lrho = matmul_py(Arho, A)  
     # N_rho  
     tmp = [[0.0]*len(A) for _ in range(len(A))]  
     for i in range(len(A)):  
@@ -46,16 +51,45 @@ def Q_correction(rho, A, W1, W2, eps):
             for k in range(len(A)):  
                 s += W1[i][k]*Lrho[k][j]  
             tmp[i][j] = s if s>0 else 0  
-    Nrho = matmul(matmul(W2, tmp), transpose(W2))  
+    Nrho = matmul_py(matmul_py(W2, tmp), transpose_py(W2))  
     # C_rho  
-    Crho = matmul(rho, rho)  
+    Crho = matmul_py(rho, rho)  
     for i in range(len(A)):  
         for j in range(len(A)):  
             Crho[i][j] *= -eps  
     # Commutator and trace  
-    comm = commutator(Nrho, Crho)  
+    comm = commutator_py(Nrho, Crho)  
     QC = 0.0  
     for i in range(len(A)):  
         for j in range(len(A)):  
             QC += comm[i][j]*rho[j][i]  
-    return QC  
\ No newline at end of file
+    return QC  
+  
+# — Public primitives: fastest registered backend (see op_registry) —   
+def _call(name, *args, **kwargs):  
+    from op_registry import call  
+    return call(name, *args, **kwargs)  
+  
+def lift_density(x):  
+    """ρ = diag(x)"""  
+    return _call('lift_density', x)  
+  
+def matmul(A, B):  
+    """A·B"""  
+    return _call('matmul', A, B)  
+  
+def transpose(A):  
+    """Aᵀ"""  
+    return _call('transpose', A)  
+  
+def trace(M):  
+    """Tr(M)"""  
+    return _call('trace', M)  
+  
+def commutator(A, B):  
+    """[A,B] = A·B − B·A"""  
+    return _call('commutator', A, B)  
+  
+def Q_correction(rho, A, W1, W2, eps):  
+    """Q_q = Tr([N_rho, C_rho]·rho); 0 for finite rho (density_ops)"""  
+    return _call('Q_correction', rho, A, W1, W2, eps)  
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""Sparse (CSR) adjacency for the graph drift operator L[x] = Aᵀ·x."""
+
+from array import array
+
+
+class SparseAdjacency:
+    """
+    n×n adjacency in CSR form: row j holds the edges j → indices[p]
+    with weight data[p], for p in indptr[j]:indptr[j+1].
+
+    Storage is stdlib `array`s, so a 10^6-node graph never exists as a
+    list of lists and the buffers can be viewed by NumPy without a copy.
+    """
+
+    def __init__(self, n, indptr, indices, data):
+        self.n = n
+        self.indptr = array('q', indptr)
+        self.indices = array('q', indices)
+        self.data = array('d', data)
+        if len(self.indptr) != n + 1 or len(self.indices) != len(self.data):
+            raise ValueError('Inconsistent CSR buffers')
+        self._np = None
+
+    @classmethod
+    def from_coo(cls, n, rows, cols, data=None):
+        """Build from COO triplets A[rows[p]][cols[p]] = data[p] (default 1)."""
+        nnz = len(rows)
+        if data is None:
+            data = [1.0] * nnz
+        # Counting sort by row: O(n + nnz)
+        counts = [0] * (n + 1)
+        for r in rows:
+            counts[r + 1] += 1
+        for j in range(n):
+            counts[j + 1] += counts[j]
+        fill = counts[:-1]
+        indices = [0] * nnz
+        values = [0.0] * nnz
+        for r, c, v in zip(rows, cols, data):
+            p = fill[r]
+            indices[p] = c
+            values[p] = v
+            fill[r] = p + 1
+        return cls(n, counts, indices, values)
+
+    @classmethod
+    def from_edges(cls, n, edges):
+        """Build from (src, dst) or (src, dst, weight) tuples."""
+        rows, cols, data = [], [], []
+        for e in edges:
+            rows.append(e[0])
+            cols.append(e[1])
+            data.append(float(e[2]) if len(e) > 2 else 1.0)
+        return cls.from_coo(n, rows, cols, data)
+
+    @classmethod
+    def from_dense(cls, A):
+        """Keep only the nonzero entries of a dense list-of-lists (or array)."""
+        rows, cols, data = [], [], []
+        for j, row in enumerate(A):
+            for i, a in enumerate(row):
+                if a:
+                    rows.append(j)
+                    cols.append(i)
+                    data.append(float(a))
+        return cls.from_coo(len(A), rows, cols, data)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def to_dense(self):
+        A = [[0.0] * self.n for _ in range(self.n)]
+        for j in range(self.n):
+            for p in range(self.indptr[j], self.indptr[j + 1]):
+                A[j][self.indices[p]] += self.data[p]
+        return A
+
+    def rmatvec(self, x):
+        """Aᵀ·x in O(n + nnz), pure Python."""
+        out = [0.0] * self.n
+        indptr, indices, data = self.indptr, self.indices, self.data
+        for j in range(self.n):
+            xj = x[j]
+            for p in range(indptr[j], indptr[j + 1]):
+                out[indices[p]] += data[p] * xj
+        return out
+
+    def _numpy_view(self):
+        # Entries regrouped by destination column, so X·A is a gather,
+        # a scale and one segmented sum (np.add.reduceat).
+        if self._np is None:
+            import numpy as np
+            indptr = np.frombuffer(self.indptr, dtype=np.int64)
+            cols = np.frombuffer(self.indices, dtype=np.int64)
+            rows = np.repeat(np.arange(self.n, dtype=np.int64), np.diff(indptr))
+            order = np.argsort(cols, kind='stable')
+            dst = cols[order]
+            starts = np.flatnonzero(np.r_[True, dst[1:] != dst[:-1]]) if len(dst) else dst
+            self._np = (rows[order], np.frombuffer(self.data)[order], dst[starts], starts)
+        return self._np
+
+    def rmatmat(self, X, out=None):
+        """
+        Row-batched drift X·A for X of shape (batch, n): row b of the
+        result is Aᵀ·X[b]. Costs O(batch·nnz).
+        """
+        import numpy as np
+        X = np.asarray(X)
+        src, w, dst, starts = self._numpy_view()
+        if out is None:
+            out = np.zeros(X.shape, dtype=np.result_type(X, np.float64))
+        else:
+            out[...] = 0.0
+        if len(src):
+            contrib = X[..., src] * w
+            out[..., dst] = np.add.reduceat(contrib, starts, axis=-1)
+        return out
+
+
+def as_sparse(A):
+    """Coerce a SparseAdjacency or any object with .tocoo() (scipy.sparse)."""
+    if isinstance(A, SparseAdjacency):
+        return A
+    coo = A.tocoo()
+    return SparseAdjacency.from_coo(coo.shape[0], coo.row.tolist(),
+                                    coo.col.tolist(), coo.data.tolist())
+
+
+def is_sparse(A):
+    return isinstance(A, SparseAdjacency) or hasattr(A, 'tocoo')
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from cube import HyperdimensionalCube, PointSource
+from cube_ooc import OutOfCoreCube
+from cube_parallel import ParallelCube
+
+SIZE, LP2, D, STEPS = 10, 0.02, 0.05, 4
+
+
+def _roll_laplacian(arr):
+    out = -2.0 * arr.ndim * arr
+    for axis in range(arr.ndim):
+        out += np.roll(arr, 1, axis) + np.roll(arr, -1, axis)
+    return out
+
+
+def _reference(state, info, steps, source=None):
+    # The explicit step written out with np.roll
+    state = state.copy()
+    for _ in range(steps):
+        state = state + D * _roll_laplacian(state) + LP2 * _roll_laplacian(info)
+        if source is not None:
+            np.add.at(state, tuple(source.coords.T), source.values)
+    return state
+
+
+@pytest.fixture
+def fields():
+    rng = np.random.default_rng(0)
+    shape = (SIZE,) * 3
+    return rng.random(shape), rng.random(shape)
+
+
+@pytest.fixture
+def source():
+    # Sites on slab edges, a repeated site and the wrap-around planes
+    return PointSource([(0, 1, 2), (9, 9, 9), (4, 4, 4), (4, 4, 4), (5, 0, 3)],
+                       [1.0, -2.0, 0.5, 0.25, 3.0])
+
+
+def _ooc(tmp_path, state, info, tile=3):
+    cube = OutOfCoreCube(3, SIZE, LP2, path=str(tmp_path), tile=tile)
+    cube.state[...] = state
+    cube.info = info
+    return cube
+
+
+def _parallel(state, info, workers=3):
+    cube = ParallelCube(3, SIZE, LP2, workers=workers)
+    cube.state[...] = state
+    cube.info = info
+    return cube
+
+
+@pytest.mark.parametrize('tile', [1, 3, SIZE])
+def test_out_of_core_matches_roll_stencil(tmp_path, fields, source, tile):
+    state, info = fields
+    cube = _ooc(tmp_path, state, info, tile)
+    cube.step_n(STEPS, D, source)
+    np.testing.assert_allclose(cube.state, _reference(state, info, STEPS, source),
+                               rtol=0, atol=1e-12)
+
+
+def test_out_of_core_step_spectral_steps(tmp_path, fields):
+    state, info = fields
+    cube = _ooc(tmp_path, state, info)
+    cube.step_spectral(STEPS, D)
+    assert cube.t == STEPS
+    np.testing.assert_allclose(cube.state, _reference(state, info, STEPS),
+                               rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_parallel_matches_roll_stencil(fields, source, workers):
+    state, info = fields
+    with _parallel(state, info, workers) as cube:
+        cube.step_n(STEPS, D, source)
+        np.testing.assert_allclose(cube.state, _reference(state, info, STEPS, source),
+                                   rtol=0, atol=1e-12)
+
+
+def test_parallel_schedule_and_closed_cube(fields, source):
+    state, info = fields
+    cube = _parallel(state, info)
+    cube.step_n(2, D, lambda t: source if t % 2 == 0 else None)
+    cube.close()
+    cube.step_n(2, D, source)
+    expected = _reference(state, info, 1, source)
+    expected = _reference(expected, info, 1)
+    expected = _reference(expected, info, 2, source)
+    assert cube.t == 4
+    np.testing.assert_allclose(cube.state, expected, rtol=0, atol=1e-12)
+
+
+def test_drift_shadow_follows_subclasses(tmp_path, fields):
+    state, info = fields
+    ref = HyperdimensionalCube(3, SIZE, LP2, dtype=np.float32)
+    ooc = OutOfCoreCube(3, SIZE, LP2, path=str(tmp_path), tile=3, dtype=np.float32)
+    par = ParallelCube(3, SIZE, LP2, workers=2, dtype=np.float32)
+    try:
+        for cube in (ref, ooc, par):
+            cube.state[...] = state
+            cube.info = info
+            cube.track_drift(4)
+            cube.step_n(STEPS, D)
+            # A stale shadow would lag the lattice by a whole diffusion step
+            assert 0.0 < cube.max_drift < 1e-5
+    finally:
+        par.close()
@@ -0,0 +1,120 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from cube import HyperdimensionalCube
+from cube_checkpoint import Checkpointer, load_checkpoint
+
+
+def _cube(dtype=float, accumulate=None):
+    rng = np.random.default_rng(0)
+    cube = HyperdimensionalCube(3, 12, 0.05, dtype=dtype, accumulate=accumulate)
+    cube.state[...] = rng.random(cube.state.shape)
+    cube.info = rng.random(cube.state.shape)
+    return cube
+
+
+def _slot(path):
+    with open(os.path.join(path, 'meta.json')) as f:
+        return json.load(f)['slot']
+
+
+def _assert_restores(path, cube):
+    restored, meta = load_checkpoint(path)
+    assert meta['t'] == cube.t
+    np.testing.assert_array_equal(restored.state, cube.state)
+    np.testing.assert_array_equal(restored.info, cube.info)
+
+
+def test_saves_alternate_slots(tmp_path):
+    cube = _cube()
+    ck = Checkpointer(cube, str(tmp_path), tile_planes=3)
+    slots = []
+    for _ in range(4):
+        ck.save()
+        slots.append(_slot(tmp_path))
+        _assert_restores(tmp_path, cube)
+        cube.step(0.1)
+    assert slots == ['slot-0', 'slot-1', 'slot-0', 'slot-1']
+
+
+def test_incremental_save_writes_changed_and_stale_tiles(tmp_path):
+    cube = _cube()
+    ck = Checkpointer(cube, str(tmp_path), tile_planes=3)
+    assert ck.save() == 8             # 4 tiles per field, full
+    assert ck.save() == 8             # second slot starts empty: full too
+    assert ck.save() == 0             # nothing changed, nothing stale
+    cube.state[4] += 1.0              # tile 1 only
+    assert ck.save() == 1
+    _assert_restores(tmp_path, cube)
+    cube.state[10] += 1.0             # tile 3, plus tile 1 this slot missed
+    assert ck.save() == 2
+    _assert_restores(tmp_path, cube)
+    assert ck.save() == 1             # the other slot still lacks tile 3
+    _assert_restores(tmp_path, cube)
+
+
+def test_threshold_counts_tiles_and_bounds_error(tmp_path):
+    cube = _cube()
+    ck = Checkpointer(cube, str(tmp_path), tile_planes=4, threshold=1e-3)
+    assert ck.save() == 6             # 3 tiles per field, not 12 planes
+    cube.state[0, 0, 0] += 1e-4
+    ck.save()
+    restored, _ = load_checkpoint(str(tmp_path))
+    assert np.abs(restored.state - cube.state).max() <= 1e-3
+
+
+def test_interrupted_save_keeps_previous_checkpoint(tmp_path):
+    cube = _cube()
+    ck = Checkpointer(cube, str(tmp_path), tile_planes=3)
+    ck.save()
+    expected = np.array(cube.state)
+    # A crash after the inactive slot was (partly) written, before meta.json
+    inactive = os.path.join(tmp_path, 'slot-1')
+    os.makedirs(inactive)
+    with open(os.path.join(inactive, 'state.bin'), 'wb') as f:
+        f.write(b'\xff' * expected.nbytes)
+    restored, _ = load_checkpoint(str(tmp_path))
+    np.testing.assert_array_equal(restored.state, expected)
+
+
+def test_restart_from_copy_on_write_checkpoint(tmp_path):
+    cube = _cube()
+    Checkpointer(cube, str(tmp_path)).save()
+    resumed, _ = load_checkpoint(str(tmp_path))
+    ck = Checkpointer(resumed, str(tmp_path), tile_planes=3)
+    for _ in range(3):
+        resumed.step_n(2, 0.1)
+        ck.save()
+        _assert_restores(tmp_path, resumed)
+
+
+def test_accumulate_round_trips(tmp_path):
+    cube = _cube(dtype=np.float32, accumulate=np.float64)
+    Checkpointer(cube, str(tmp_path)).save()
+    restored, meta = load_checkpoint(str(tmp_path))
+    assert meta['accumulate'] == np.dtype(np.float64).str
+    assert restored.dtype == np.float32
+    assert restored.accumulate == np.float64
+
+
+def test_write_through_cubes_are_refused(tmp_path):
+    cube = _cube()
+    Checkpointer(cube, str(tmp_path)).save()
+    with pytest.raises(ValueError):
+        load_checkpoint(str(tmp_path), mode='r+')
+    live = np.memmap(os.path.join(tmp_path, 'slot-0', 'state.bin'),
+                     dtype=cube.dtype, mode='r+', shape=cube.state.shape)
+    with pytest.raises(ValueError):
+        Checkpointer(HyperdimensionalCube.from_arrays(live, cube.info.copy(), 0.05),
+                     str(tmp_path))
+
+
+def test_threshold_rejects_memory_mapped_fields(tmp_path):
+    cube = _cube()
+    Checkpointer(cube, str(tmp_path / 'a')).save()
+    resumed, _ = load_checkpoint(str(tmp_path / 'a'))
+    with pytest.raises(ValueError):
+        Checkpointer(resumed, str(tmp_path / 'b'), threshold=1e-3).save()
@@ -0,0 +1,103 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+from history_log import SpillingLog
+
+with contextlib.redirect_stdout(io.StringIO()):
+    # Both modules print a table on import
+    import Pi0Unified
+    import USSKernel
+
+
+def _entries(count):
+    return [{'t': i // 3, 'v': i} for i in range(count)]
+
+
+def _fill(log, entries):
+    for entry in entries:
+        log.append(entry)
+    return log
+
+
+@pytest.fixture
+def spilled(tmp_path):
+    ref = _entries(700)
+    log = _fill(SpillingLog(maxlen=40, path=str(tmp_path), key='t',
+                            segment_entries=128, stride=16), ref)
+    yield log, ref
+    log.close()
+
+
+def test_indexing_and_iteration_cover_spilled_entries(spilled):
+    log, ref = spilled
+    assert len(log) == len(ref)
+    assert list(log) == ref
+    for i in (0, 15, 16, 127, 128, 659, 660, 699, -1, -700):
+        assert log[i] == ref[i]
+    assert log[100:140] == ref[100:140]
+    with pytest.raises(IndexError):
+        log[700]
+
+
+@pytest.mark.parametrize('seq', [0, 1, 16, 127, 128, 300, 659, 660, 699, 700, 900])
+def test_since_returns_the_tail(spilled, seq):
+    log, ref = spilled
+    assert log.since(seq) == ref[seq:]
+
+
+@pytest.mark.parametrize('lo, hi', [(None, None), (0, 0), (5, 77), (None, 30),
+                                    (42, 43), (200, None), (219, 240), (-5, -1),
+                                    (300, 400)])
+def test_query_matches_a_linear_scan(spilled, lo, hi):
+    log, ref = spilled
+    expected = [e for e in ref if (lo is None or e['t'] >= lo) and
+                (hi is None or e['t'] <= hi)]
+    assert log.query(lo, hi) == expected
+
+
+def test_reopen_restores_ring_and_segments(tmp_path):
+    ref = _entries(500)
+    log = _fill(SpillingLog(maxlen=40, path=str(tmp_path), key='t',
+                            segment_entries=128, stride=16), ref)
+    log.close()
+    reopened = SpillingLog(maxlen=40, path=str(tmp_path), key='t',
+                           segment_entries=128, stride=16)
+    assert len(reopened) == 500 and list(reopened) == ref
+    assert reopened.since(480) == ref[480:]
+    assert reopened.query(100, 110) == [e for e in ref if 100 <= e['t'] <= 110]
+    more = [{'t': 170 + i, 'v': 500 + i} for i in range(100)]
+    _fill(reopened, more)
+    assert list(reopened) == ref + more
+    reopened.close()
+
+
+def test_temporary_directory_is_removed(tmp_path):
+    log = _fill(SpillingLog(maxlen=5, segment_entries=8), range(50))
+    path = log.path
+    assert os.path.isdir(path) and list(log) == list(range(50))
+    log.close()
+    assert not os.path.exists(path)
+    assert list(log) == list(range(45, 50))
+
+
+def test_kernels_spill_into_fresh_directories(tmp_path):
+    spill_dir = str(tmp_path)
+    for _ in range(2):
+        system = Pi0Unified.Pi0System(retain=4, spill_dir=spill_dir)
+        for _ in range(20):
+            system.iterate()
+        # A restart must not pick up the previous run's generations
+        generations = [e['generation'] for e in system.pi0_kernel.memory]
+        assert generations == list(range(1, 21))
+        assert system.history.query(5, 7)[0]['pi0']['generation'] == 5
+        system.close()
+    assert len(os.listdir(spill_dir)) == 2
+    kernel = USSKernel.USSKernel(retain=2, spill_dir=spill_dir)
+    for i in range(6):
+        kernel.communicate('peer', 'm%d' % i)
+    assert [p['timestamp'] for p in kernel.audit_log] == list(range(1, 7))
+    assert os.path.dirname(kernel.spill_dir) == spill_dir
+    kernel.close()
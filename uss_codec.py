@@ -0,0 +1,58 @@
+"""
+Table-driven USS shift codec: c -> chr((ord(c) + k) % 256), as used by the
+USSKernel variants, at str.translate/bytes.translate speed.
+Standard library only.
+"""
+
+# TABLES[k][b] = (b + k) % 256, one 256-byte translation table per shift
+TABLES = tuple(bytes((b + k) % 256 for b in range(256)) for k in range(256))
+
+
+def encode_bytes(data, shift):
+    """Shift every byte of `data` by `shift` (mod 256)."""
+    return bytes(data).translate(TABLES[shift % 256])
+
+
+def decode_bytes(data, shift):
+    return bytes(data).translate(TABLES[-shift % 256])
+
+
+def encode(text, shift):
+    """
+    chr((ord(c) + shift) % 256) for every character. Latin-1 text (all of
+    ASCII included) goes through one bytes.translate; characters above
+    U+00FF fold into 0..255 exactly as the per-character form does.
+    """
+    try:
+        data = text.encode('latin-1')
+    except UnicodeEncodeError:
+        return ''.join([chr((ord(c) + shift) % 256) for c in text])
+    return data.translate(TABLES[shift % 256]).decode('latin-1')
+
+
+def decode(text, shift):
+    """Inverse of encode for latin-1 input (wider characters are lossy)."""
+    return encode(text, -shift)
+
+
+def text_sum(text):
+    """sum(ord(c) for c in text), summed over bytes when text is latin-1."""
+    try:
+        return sum(text.encode('latin-1'))
+    except UnicodeEncodeError:
+        return sum(map(ord, text))
+
+
+def encode_many(messages, shifts):
+    """encode() over paired messages and shifts (an int applies to all)."""
+    if isinstance(shifts, int):
+        table = TABLES[shifts % 256]
+        return [_encode_with(m, table, shifts) for m in messages]
+    return [encode(m, k) for m, k in zip(messages, shifts)]
+
+
+def _encode_with(text, table, shift):
+    try:
+        return text.encode('latin-1').translate(table).decode('latin-1')
+    except UnicodeEncodeError:
+        return encode(text, shift)